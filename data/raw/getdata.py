@@ -1,195 +1,273 @@
+# data/raw/getdata.py
+#
+# Aucun effet de bord à l'import : le téléchargement ne part qu'en lançant
+# le script (main), et yfinance / requests ne sont importés qu'à ce moment.
+
 from datetime import datetime, timedelta
-from pathlib import Path
 
 import pandas as pd
-import requests
-import yfinance as yf
 
-# --- Paths / constants ---
+from eurostoxx_iv_rv_backtest.alignment import (
+    DEFAULT_MAX_STALENESS,
+    align_to_calendar,
+    build_trading_calendar,
+)
+from eurostoxx_iv_rv_backtest.config import DATA_RAW, ensure_dirs
 
-DATA_RAW = Path("data/raw")
-DATA_RAW.mkdir(parents=True, exist_ok=True)
+# --- Constants ---
 
 TICKER_SX5E = "^STOXX50E"
 V2TX_URL = "https://www.stoxx.com/document/Indices/Current/HistoricalData/h_v2tx.txt"
 
-# --- Period: approx 20 years back ---
+# Sous-indices VSTOXX par maturité (même format que h_v2tx.txt)
+V2TX_SUBINDEX_URL = (
+    "https://www.stoxx.com/document/Indices/Current/HistoricalData/h_{symbol}.txt"
+)
+V2TX_SUBINDICES = {
+    "1m": "v6i1",
+    "2m": "v6i2",
+    "3m": "v6i3",
+    "6m": "v6i4",
+    "9m": "v6i5",
+    "12m": "v6i6",
+    "18m": "v6i7",
+    "24m": "v6i8",
+}
+
+
+def main() -> None:
+    """
+    Télécharge SX5E (yfinance), V2TX et ses sous-indices (STOXX), puis écrit
+    les fichiers de travail alignés dans DATA_RAW.
+    """
+    import requests
+    import yfinance as yf
+
+    ensure_dirs()
+
+    # --- Period: approx 20 years back ---
+
+    end_date = datetime.today()
+    start_date = end_date - timedelta(days=20 * 365)
+
+    # =========================
+    # 1) EURO STOXX 50 via yfinance
+    # =========================
+
+    print(">>> Downloading SX5E from Yahoo Finance...")
+
+    df_sx5e = yf.download(
+        TICKER_SX5E,
+        start=start_date.strftime("%Y-%m-%d"),
+        end=end_date.strftime("%Y-%m-%d"),
+        interval="1d",
+        auto_adjust=False,
+        progress=False,
+    )
+
+    if df_sx5e is None or len(df_sx5e) == 0:
+        raise RuntimeError(
+            f"Aucune donnée renvoyée par yfinance pour le ticker {TICKER_SX5E}."
+        )
 
-end_date = datetime.today()
-start_date = end_date - timedelta(days=20 * 365)
+    print("Colonnes brutes SX5E :", list(df_sx5e.columns))
 
-# =========================
-# 1) EURO STOXX 50 via yfinance
-# =========================
+    # Flatten colonnes si MultiIndex (cas yfinance)
+    if isinstance(df_sx5e.columns, pd.MultiIndex):
+        df_sx5e.columns = df_sx5e.columns.get_level_values(0)
 
-print(">>> Downloading SX5E from Yahoo Finance...")
+    print("Colonnes après flatten SX5E :", list(df_sx5e.columns))
 
-df_sx5e = yf.download(
-    TICKER_SX5E,
-    start=start_date.strftime("%Y-%m-%d"),
-    end=end_date.strftime("%Y-%m-%d"),
-    interval="1d",
-    auto_adjust=False,
-    progress=False,
-)
+    # On reset l'index -> la colonne 'Date' devient une colonne normale
+    df_sx5e_raw = df_sx5e.reset_index()
+
+    # Sauvegarde RAW (tel que venant de yfinance)
+    raw_sx5e_path = DATA_RAW / "SXE50_yf_raw.csv"
+    df_sx5e_raw.to_csv(raw_sx5e_path, index=False)
+    print(f"[RAW] SX5E sauvegardé dans : {raw_sx5e_path.resolve()}")
+
+    # Vérification des colonnes attendues avant renommage
+    expected_cols = {"Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"}
+    missing = expected_cols.difference(set(df_sx5e_raw.columns))
+    if missing:
+        raise RuntimeError(
+            f"Colonnes manquantes après reset_index pour SX5E : {missing}\n"
+            f"Colonnes réelles : {list(df_sx5e_raw.columns)}"
+        )
+
+    # DataFrame de travail SX5E
+    df_sx5e_work = df_sx5e_raw.rename(
+        columns={
+            "Date": "date",
+            "Open": "open",
+            "High": "high",
+            "Low": "low",
+            "Close": "close",
+            "Adj Close": "adj_close",
+            "Volume": "volume",
+        }
+    )
+
+    # date -> datetime (normalement déjà Timestamp, mais on verrouille)
+    df_sx5e_work["date"] = pd.to_datetime(df_sx5e_work["date"])
+
+    if "close" not in df_sx5e_work.columns:
+        raise RuntimeError(
+            f"La colonne 'close' n'existe pas après renommage. Colonnes = {list(df_sx5e_work.columns)}"
+        )
 
-if df_sx5e is None or len(df_sx5e) == 0:
-    raise RuntimeError(
-        f"Aucune donnée renvoyée par yfinance pour le ticker {TICKER_SX5E}."
+    df_sx5e_work = (
+        df_sx5e_work.dropna(subset=["close"]).sort_values("date").reset_index(drop=True)
     )
 
-print("Colonnes brutes SX5E :", list(df_sx5e.columns))
+    print("=== SX5E (sous-jacent, fichier de travail) ===")
+    print(df_sx5e_work.head(5))
+    print(
+        f"\nSX5E lignes: {len(df_sx5e_work)} | "
+        f"De {df_sx5e_work['date'].min().date()} à {df_sx5e_work['date'].max().date()}"
+    )
 
-# Flatten colonnes si MultiIndex (cas yfinance)
-if isinstance(df_sx5e.columns, pd.MultiIndex):
-    df_sx5e.columns = df_sx5e.columns.get_level_values(0)
+    work_sx5e_path = DATA_RAW / "SXE50_daily_20y.csv"
+    df_sx5e_work.to_csv(work_sx5e_path, index=False)
+    print(f"\n Fichier de travail SX5E exporté dans : {work_sx5e_path.resolve()}")
 
-print("Colonnes après flatten SX5E :", list(df_sx5e.columns))
+    # =========================
+    # 2) V2TX / VSTOXX (IV du SX5E) via STOXX
+    # =========================
 
-# On reset l'index -> la colonne 'Date' devient une colonne normale
-df_sx5e_raw = df_sx5e.reset_index()
+    print("\n>>> Downloading V2TX (VSTOXX) raw txt from STOXX...")
 
-# Sauvegarde RAW (tel que venant de yfinance)
-raw_sx5e_path = DATA_RAW / "SXE50_yf_raw.csv"
-df_sx5e_raw.to_csv(raw_sx5e_path, index=False)
-print(f"[RAW] SX5E sauvegardé dans : {raw_sx5e_path.resolve()}")
+    raw_v2tx_txt_path = DATA_RAW / "h_v2tx.txt"
+    resp = requests.get(V2TX_URL, timeout=20)
+    resp.raise_for_status()
+    raw_v2tx_txt_path.write_text(resp.text, encoding="utf-8")
+    print(f"[RAW] V2TX txt sauvegardé dans : {raw_v2tx_txt_path.resolve()}")
 
-# Vérification des colonnes attendues avant renommage
-expected_cols = {"Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"}
-missing = expected_cols.difference(set(df_sx5e_raw.columns))
-if missing:
-    raise RuntimeError(
-        f"Colonnes manquantes après reset_index pour SX5E : {missing}\n"
-        f"Colonnes réelles : {list(df_sx5e_raw.columns)}"
+    # Lecture du txt brut
+    df_v2tx_raw = pd.read_csv(
+        raw_v2tx_txt_path,
+        sep=";",
     )
 
-# DataFrame de travail SX5E
-df_sx5e_work = df_sx5e_raw.rename(
-    columns={
-        "Date": "date",
-        "Open": "open",
-        "High": "high",
-        "Low": "low",
-        "Close": "close",
-        "Adj Close": "adj_close",
-        "Volume": "volume",
-    }
-)
+    expected_v2tx_cols = {"Date", "Symbol", "Indexvalue"}
+    missing_v2 = expected_v2tx_cols.difference(set(df_v2tx_raw.columns))
+    if missing_v2:
+        raise RuntimeError(
+            f"Colonnes manquantes dans le fichier V2TX : {missing_v2}\n"
+            f"Colonnes réelles : {list(df_v2tx_raw.columns)}"
+        )
 
-# date -> datetime (normalement déjà Timestamp, mais on verrouille)
-df_sx5e_work["date"] = pd.to_datetime(df_sx5e_work["date"])
+    # DataFrame de travail V2TX
+    df_v2tx_work = df_v2tx_raw.copy()
+    df_v2tx_work["Date"] = pd.to_datetime(df_v2tx_work["Date"], dayfirst=True)
 
-if "close" not in df_sx5e_work.columns:
-    raise RuntimeError(
-        f"La colonne 'close' n'existe pas après renommage. Colonnes = {list(df_sx5e_work.columns)}"
+    df_v2tx_work = df_v2tx_work.rename(
+        columns={
+            "Date": "date",
+            "Indexvalue": "vstoxx_close",
+        }
     )
 
-df_sx5e_work = (
-    df_sx5e_work.dropna(subset=["close"]).sort_values("date").reset_index(drop=True)
-)
+    df_sx5e_work = (
+        df_sx5e_raw.rename(
+            columns={
+                "Date": "date",
+                "Open": "open",
+                "High": "high",
+                "Low": "low",
+                "Close": "close",
+                "Adj Close": "adj_close",
+                "Volume": "volume",
+            }
+        )
+        .dropna(subset=["close"])
+        .sort_values(by="date")
+        .reset_index(drop=True)
+    )
 
-print("=== SX5E (sous-jacent, fichier de travail) ===")
-print(df_sx5e_work.head(5))
-print(
-    f"\nSX5E lignes: {len(df_sx5e_work)} | "
-    f"De {df_sx5e_work['date'].min().date()} à {df_sx5e_work['date'].max().date()}"
-)
+    # IV en décimal (0.20 pour 20 %)
+    df_v2tx_work["iv"] = df_v2tx_work["vstoxx_close"] / 100.0
 
-work_sx5e_path = DATA_RAW / "SXE50_daily_20y.csv"
-df_sx5e_work.to_csv(work_sx5e_path, index=False)
-print(f"\n Fichier de travail SX5E exporté dans : {work_sx5e_path.resolve()}")
+    print("\n=== V2TX (IV, fichier de travail avant filtre) ===")
+    print(df_v2tx_work.head(5))
 
+    work_v2tx_path = DATA_RAW / "V2TX_full_daily.csv"
+    df_v2tx_work.to_csv(work_v2tx_path, index=False)
+    print(
+        f"\n Fichier de travail V2TX (full) exporté dans : {work_v2tx_path.resolve()}"
+    )
 
-# =========================
-# 2) V2TX / VSTOXX (IV du SX5E) via STOXX
-# =========================
+    # =========================
+    # 3) FICHIER DE TRAVAIL FUSIONNÉ SX5E + IV
+    # =========================
+
+    # 🔹 Calendrier de trading = dates SX5E ; IV jointe par as-of merge trié,
+    # propagée au plus DEFAULT_MAX_STALENESS jours (NaN au-delà, et au début)
+    calendar = build_trading_calendar(df_sx5e_work["date"])
+
+    df_merged, gaps = align_to_calendar(
+        calendar,
+        {
+            "sx5e": df_sx5e_work,
+            "v2tx": df_v2tx_work[["date", "vstoxx_close", "iv"]],
+        },
+        max_staleness={"sx5e": 0, "v2tx": DEFAULT_MAX_STALENESS},
+    )
 
-print("\n>>> Downloading V2TX (VSTOXX) raw txt from STOXX...")
+    print("\n=== Rapport d'alignement (trous) ===")
+    print(gaps)
 
-raw_v2tx_txt_path = DATA_RAW / "h_v2tx.txt"
-resp = requests.get(V2TX_URL, timeout=20)
-resp.raise_for_status()
-raw_v2tx_txt_path.write_text(resp.text, encoding="utf-8")
-print(f"[RAW] V2TX txt sauvegardé dans : {raw_v2tx_txt_path.resolve()}")
+    print("\n=== Fichier de travail MERGÉ SX5E + IV ===")
+    print(df_merged.head(5))
 
-# Lecture du txt brut
-df_v2tx_raw = pd.read_csv(
-    raw_v2tx_txt_path,
-    sep=";",
-)
+    merged_path = DATA_RAW / "SXE50_with_IV_daily_20y.csv"
+    df_merged.to_csv(merged_path, index=False)
+    print(f"\n Fichier de travail fusionné exporté dans : {merged_path.resolve()}")
 
-expected_v2tx_cols = {"Date", "Symbol", "Indexvalue"}
-missing_v2 = expected_v2tx_cols.difference(set(df_v2tx_raw.columns))
-if missing_v2:
-    raise RuntimeError(
-        f"Colonnes manquantes dans le fichier V2TX : {missing_v2}\n"
-        f"Colonnes réelles : {list(df_v2tx_raw.columns)}"
-    )
+    # =========================
+    # 4) COURBE VSTOXX : SOUS-INDICES 1M ... 24M
+    # =========================
 
-# DataFrame de travail V2TX
-df_v2tx_work = df_v2tx_raw.copy()
-df_v2tx_work["Date"] = pd.to_datetime(df_v2tx_work["Date"], dayfirst=True)
+    print("\n>>> Downloading VSTOXX sub-indices (term structure) from STOXX...")
 
-df_v2tx_work = df_v2tx_work.rename(
-    columns={
-        "Date": "date",
-        "Indexvalue": "vstoxx_close",
-    }
-)
+    term_sources = {}
 
-df_sx5e_work = (
-    df_sx5e_raw.rename(
-        columns={
-            "Date": "date",
-            "Open": "open",
-            "High": "high",
-            "Low": "low",
-            "Close": "close",
-            "Adj Close": "adj_close",
-            "Volume": "volume",
-        }
-    )
-    .dropna(subset=["close"])
-    .sort_values(by="date")
-    .reset_index(drop=True)
-)
+    for tenor, symbol in V2TX_SUBINDICES.items():
+        raw_txt_path = DATA_RAW / f"h_{symbol}.txt"
+        resp = requests.get(V2TX_SUBINDEX_URL.format(symbol=symbol), timeout=20)
+        resp.raise_for_status()
+        raw_txt_path.write_text(resp.text, encoding="utf-8")
+        print(f"[RAW] {symbol.upper()} txt sauvegardé dans : {raw_txt_path.resolve()}")
 
-# IV en décimal (0.20 pour 20 %)
-df_v2tx_work["iv"] = df_v2tx_work["vstoxx_close"] / 100.0
+        df_sub = pd.read_csv(raw_txt_path, sep=";")
 
-print("\n=== V2TX (IV, fichier de travail avant filtre) ===")
-print(df_v2tx_work.head(5))
+        missing_sub = {"Date", "Indexvalue"}.difference(set(df_sub.columns))
+        if missing_sub:
+            raise RuntimeError(
+                f"Colonnes manquantes dans le fichier {symbol.upper()} : {missing_sub}\n"
+                f"Colonnes réelles : {list(df_sub.columns)}"
+            )
 
-work_v2tx_path = DATA_RAW / "V2TX_full_daily.csv"
-df_v2tx_work.to_csv(work_v2tx_path, index=False)
-print(f"\n Fichier de travail V2TX (full) exporté dans : {work_v2tx_path.resolve()}")
+        df_sub["date"] = pd.to_datetime(df_sub["Date"], dayfirst=True)
+        df_sub[f"iv_{tenor}"] = df_sub["Indexvalue"] / 100.0
+        term_sources[tenor] = df_sub[["date", f"iv_{tenor}"]]
 
-# =========================
-# 3) FICHIER DE TRAVAIL FUSIONNÉ SX5E + IV
-# =========================
+    # Toutes les maturités alignées en une fois sur le même calendrier
+    df_term_iv, term_gaps = align_to_calendar(
+        calendar, term_sources, max_staleness=DEFAULT_MAX_STALENESS
+    )
+    df_term = pd.concat([df_merged, df_term_iv.drop(columns="date")], axis=1)
 
-# On restreint V2TX à la période SX5E pour être cohérent
-start_p = df_sx5e_work["date"].min()
-end_p = df_sx5e_work["date"].max()
-mask = (df_v2tx_work["date"] >= start_p) & (df_v2tx_work["date"] <= end_p)
-df_v2tx_20y = df_v2tx_work.loc[mask].reset_index(drop=True)
+    print("\n=== Rapport d'alignement courbe (trous) ===")
+    print(term_gaps)
 
-print(
-    f"\nV2TX filtré sur période SX5E : {len(df_v2tx_20y)} lignes | "
-    f"De {df_v2tx_20y['date'].min().date()} à {df_v2tx_20y['date'].max().date()}"
-)
+    print("\n=== Fichier de travail SX5E + courbe IV ===")
+    print(df_term.head(5))
 
-# 🔹 Merge sur 'date' (les deux colonnes sont en datetime -> format interne, pas un problème)
-df_merged = pd.merge(
-    df_sx5e_work,
-    df_v2tx_20y[["date", "vstoxx_close", "iv"]],
-    on="date",
-    how="left",  # left: on garde toutes les dates SX5E, IV peut être NaN au début
-)
+    term_path = DATA_RAW / "SXE50_with_IV_term_daily_20y.csv"
+    df_term.to_csv(term_path, index=False)
+    print(f"\n Fichier de travail courbe exporté dans : {term_path.resolve()}")
 
-print("\n=== Fichier de travail MERGÉ SX5E + IV ===")
-print(df_merged.head(5))
 
-merged_path = DATA_RAW / "SXE50_with_IV_daily_20y.csv"
-df_merged.to_csv(merged_path, index=False)
-print(f"\n Fichier de travail fusionné exporté dans : {merged_path.resolve()}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# src/eurostoxx_iv_rv_backtest/alignment.py
+
+from typing import Mapping, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Nombre max de jours de bourse sur lesquels on propage une IV (ffill)
+DEFAULT_MAX_STALENESS = 3
+
+
+def ensure_sorted(df: pd.DataFrame, by: str = "date") -> pd.DataFrame:
+    """
+    Renvoie df trié sur 'by', en sautant le tri quand c'est possible :
+      - colonne déjà monotone (ex: CSV relu) → simple vérif O(n), df inchangé
+      - sinon tri + reset_index
+    """
+    if df[by].is_monotonic_increasing:
+        return df
+
+    return df.sort_values(by).reset_index(drop=True)
+
+
+def build_trading_calendar(*dates: pd.Series, how: str = "base") -> pd.DatetimeIndex:
+    """
+    Calendrier de trading commun (trié, sans doublons).
+
+    - how="base"         : dates de la première série (ex: le sous-jacent)
+    - how="union"        : toutes les dates vues
+    - how="intersection" : dates communes à toutes les séries
+    """
+    if not dates:
+        raise ValueError("Il faut au moins une série de dates.")
+
+    indexes = [pd.DatetimeIndex(pd.to_datetime(d)).dropna().unique() for d in dates]
+
+    if how == "base":
+        cal = indexes[0]
+    elif how == "union":
+        cal = indexes[0]
+        for idx in indexes[1:]:
+            cal = cal.union(idx)
+    elif how == "intersection":
+        cal = indexes[0]
+        for idx in indexes[1:]:
+            cal = cal.intersection(idx)
+    else:
+        raise ValueError(f"Mode de calendrier inconnu : {how}")
+
+    return cal.sort_values().rename("date")
+
+
+def _longest_run(flags: np.ndarray) -> int:
+    """Longueur du plus long bloc consécutif de True."""
+    if not flags.any():
+        return 0
+    padded = np.concatenate([[0], flags.astype("int8"), [0]])
+    edges = np.flatnonzero(np.diff(padded))
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def align_to_calendar(
+    calendar: pd.DatetimeIndex,
+    sources: Mapping[str, pd.DataFrame],
+    max_staleness: Union[int, Mapping[str, int]] = DEFAULT_MAX_STALENESS,
+    date_col: str = "date",
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Aligne plusieurs séries sur un calendrier commun par as-of merge trié.
+
+    - sources       : nom -> DataFrame (date_col + colonnes de valeurs à joindre)
+    - max_staleness : âge max (en jours du calendrier) d'une valeur propagée ;
+                      0 = correspondance exacte uniquement. Un int s'applique
+                      à toutes les sources, un dict permet un seuil par source.
+
+    Renvoie (frame aligné, trié sur date_col ; rapport de trous). Le rapport
+    contient, par source :
+    n_exact, n_filled (propagées), n_missing, max_gap (plus long trou).
+    """
+    cal = pd.DatetimeIndex(calendar).sort_values()
+    out = pd.DataFrame({date_col: cal})
+    cal_values = cal.to_numpy()
+
+    report = []
+
+    for name, src in sources.items():
+        if date_col not in src.columns:
+            raise ValueError(f"Colonne '{date_col}' absente de la source {name}.")
+
+        limit = (
+            max_staleness.get(name, DEFAULT_MAX_STALENESS)
+            if isinstance(max_staleness, Mapping)
+            else max_staleness
+        )
+        value_cols = [c for c in src.columns if c != date_col]
+        clash = [c for c in value_cols if c in out.columns]
+        if clash:
+            raise ValueError(f"Colonnes déjà présentes (source {name}) : {clash}")
+
+        right = src[[date_col, *value_cols]].dropna(subset=[date_col])
+        right = right.dropna(subset=value_cols, how="all")
+        right = right.assign(**{date_col: pd.to_datetime(right[date_col])})
+        right = ensure_sorted(right.drop_duplicates(date_col, keep="last"), date_col)
+        right = right.assign(_src_date=right[date_col])
+
+        joined = pd.merge_asof(
+            out[[date_col]], right, on=date_col, direction="backward"
+        )
+
+        # Âge de la valeur en jours du calendrier (0 = date exacte) : position
+        # du dernier jour du calendrier <= date source. Une date source
+        # antérieure au calendrier (src_pos = -1) a un âge inconnu → manquante
+        src_pos = (
+            np.searchsorted(cal_values, joined["_src_date"].to_numpy(), side="right")
+            - 1
+        )
+        age = np.arange(len(cal_values)) - src_pos
+        has_src = joined["_src_date"].notna().to_numpy() & (src_pos >= 0)
+
+        keep = has_src & (age <= limit)
+        exact = has_src & (age == 0)
+
+        for c in value_cols:
+            out[c] = joined[c].where(keep)
+
+        report.append(
+            {
+                "source": name,
+                "n_exact": int(exact.sum()),
+                "n_filled": int((keep & ~exact).sum()),
+                "n_missing": int((~keep).sum()),
+                "max_gap": _longest_run(~exact),
+            }
+        )
+
+    gaps = pd.DataFrame(
+        report, columns=["source", "n_exact", "n_filled", "n_missing", "max_gap"]
+    ).set_index("source")
+
+    return out, gaps
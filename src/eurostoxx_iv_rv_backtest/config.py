@@ -1,11 +1,21 @@
 # src/eurostoxx_iv_rv_backtest/config.py
+#
+# Aucun accès disque à l'import : les chemins sont surchargeables par
+# variables d'environnement et les dossiers ne sont créés que par
+# ensure_dirs(), appelé par les scripts juste avant d'écrire.
 
+import os
 from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PROJECT_ROOT = Path(
+    os.environ.get("EUROSTOXX_PROJECT_ROOT", Path(__file__).absolute().parents[2])
+)
 
-DATA_RAW = PROJECT_ROOT / "data" / "raw"
-OUTPUTS = PROJECT_ROOT / "outputs"
+DATA_RAW = Path(os.environ.get("EUROSTOXX_DATA_RAW", PROJECT_ROOT / "data" / "raw"))
+OUTPUTS = Path(os.environ.get("EUROSTOXX_OUTPUTS", PROJECT_ROOT / "outputs"))
 
-DATA_RAW.mkdir(parents=True, exist_ok=True)
-OUTPUTS.mkdir(parents=True, exist_ok=True)
+
+def ensure_dirs() -> None:
+    """Crée DATA_RAW et OUTPUTS s'ils n'existent pas."""
+    DATA_RAW.mkdir(parents=True, exist_ok=True)
+    OUTPUTS.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,192 @@
+# src/eurostoxx_iv_rv_backtest/features/ewma.py
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def halflife_to_alpha(halflives: Sequence[float]) -> np.ndarray:
+    """Demi-vie (en jours) -> facteur de lissage alpha = 1 - exp(-ln2 / h)."""
+    h = np.asarray(halflives, dtype="float64")
+    if (h <= 0).any():
+        raise ValueError("Les demi-vies doivent être > 0.")
+    return 1.0 - np.exp(-np.log(2.0) / h)
+
+
+def ewm_mean_var(
+    x: np.ndarray,
+    halflives: Sequence[float],
+    min_periods: int = 1,
+    state: Optional[dict] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Moyenne et variance exponentielles (filtre IIR récursif) de la série x
+    pour toute une banque de demi-vies en une passe : O(n·k).
+
+      m_t = m_{t-1} + a * (x_t - m_{t-1})
+      v_t = (1 - a) * (v_{t-1} + a * (x_t - m_{t-1})^2)
+
+    Les NaN sont ignorés (l'état est conservé). Renvoie deux matrices (n, k),
+    NaN tant que moins de 'min_periods' observations ont été vues.
+
+    state : dict d'état du filtre (m, v, count), mis à jour en place ; permet
+            de traiter la série par morceaux successifs (calcul incrémental)
+            avec le même résultat qu'en une passe.
+    """
+    x = np.asarray(x, dtype="float64")
+    alpha = halflife_to_alpha(halflives)
+    n, k = len(x), len(alpha)
+
+    mean = np.full((n, k), np.nan)
+    var = np.full((n, k), np.nan)
+
+    state = {} if state is None else state
+    m = state.get("m", np.full(k, np.nan))
+    v = state.get("v", np.zeros(k))
+    count = state.get("count", 0)
+
+    for t in range(n):
+        xt = x[t]
+        if np.isnan(xt):
+            if count >= min_periods:
+                mean[t], var[t] = m, v
+            continue
+
+        if count == 0:
+            m = np.full(k, xt)
+        else:
+            d = xt - m
+            m = m + alpha * d
+            v = (1.0 - alpha) * (v + alpha * d * d)
+        count += 1
+
+        if count >= min_periods:
+            mean[t], var[t] = m, v
+
+    state.update(m=m, v=v, count=count)
+    return mean, var
+
+
+def ewm_zscore(
+    x: np.ndarray,
+    halflives: Sequence[float],
+    min_periods: int = 20,
+    state: Optional[dict] = None,
+) -> np.ndarray:
+    """z-score EWMA de x pour chaque demi-vie, shape (n, k) ; state : ewm_mean_var."""
+    x = np.asarray(x, dtype="float64")
+    mean, var = ewm_mean_var(x, halflives, min_periods=min_periods, state=state)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (x[:, None] - mean) / np.sqrt(var)
+    z[~np.isfinite(z)] = np.nan
+
+    return z
+
+
+def expanding_zscore(
+    x: np.ndarray,
+    min_periods: int = 20,
+    state: Optional[dict] = None,
+) -> np.ndarray:
+    """
+    z-score sur fenêtre croissante (toute l'histoire jusqu'à t), shape (n,).
+
+    state : dict des sommes cumulées (center, cnt, s1, s2), mis à jour en
+            place pour le calcul par morceaux (voir ewm_mean_var).
+    """
+    x = np.asarray(x, dtype="float64")
+    valid = ~np.isnan(x)
+
+    state = {} if state is None else state
+    if "center" not in state:
+        state["center"] = x[valid].mean() if valid.any() else 0.0
+    xc = np.where(valid, x - state["center"], 0.0)
+
+    cnt = state.get("cnt", 0) + np.cumsum(valid)
+    s1 = state.get("s1", 0.0) + np.cumsum(xc)
+    s2 = state.get("s2", 0.0) + np.cumsum(xc * xc)
+    if len(x):
+        state.update(cnt=int(cnt[-1]), s1=s1[-1], s2=s2[-1])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s1 / cnt
+        var = (s2 - s1 * s1 / cnt) / (cnt - 1)
+        z = (xc - mean) / np.sqrt(np.maximum(var, 0.0))
+
+    z[(cnt < max(min_periods, 2)) | ~valid | ~np.isfinite(z)] = np.nan
+
+    return z
+
+
+def adaptive_zscore(
+    x: np.ndarray,
+    halflives: Sequence[float],
+    fast_ratio: float = 0.25,
+    min_periods: int = 20,
+    state: Optional[dict] = None,
+) -> np.ndarray:
+    """
+    z-score EWMA à mémoire adaptative selon le régime, shape (n, k).
+
+    Pour chaque demi-vie lente h, on suit aussi une variance rapide
+    (demi-vie h * fast_ratio). Le poids w_t = clip(v_rapide / v_lente - 1, 0, 1)
+    interpole le alpha effectif entre lent (régime calme) et rapide
+    (régime agité) : le signal se recale plus vite quand la vol du spread explose.
+
+    state : dict d'état des trois filtres, mis à jour en place pour le calcul
+            par morceaux (voir ewm_mean_var).
+    """
+    x = np.asarray(x, dtype="float64")
+    h = np.asarray(halflives, dtype="float64")
+    a_slow = halflife_to_alpha(h)
+    a_fast = halflife_to_alpha(h * fast_ratio)
+    n, k = len(x), len(h)
+
+    z = np.full((n, k), np.nan)
+
+    state = {} if state is None else state
+    m = state.get("m", np.full(k, np.nan))
+    v = state.get("v", np.zeros(k))
+    m_f = state.get("m_f", np.full(k, np.nan))
+    v_f = state.get("v_f", np.zeros(k))
+    m_s = state.get("m_s", np.full(k, np.nan))
+    v_s = state.get("v_s", np.zeros(k))
+    count = state.get("count", 0)
+
+    for t in range(n):
+        xt = x[t]
+        if np.isnan(xt):
+            continue
+
+        if count == 0:
+            m = np.full(k, xt)
+            m_f = np.full(k, xt)
+            m_s = np.full(k, xt)
+        else:
+            d_f = xt - m_f
+            m_f = m_f + a_fast * d_f
+            v_f = (1.0 - a_fast) * (v_f + a_fast * d_f * d_f)
+
+            d_s = xt - m_s
+            m_s = m_s + a_slow * d_s
+            v_s = (1.0 - a_slow) * (v_s + a_slow * d_s * d_s)
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                w = np.clip(v_f / v_s - 1.0, 0.0, 1.0)
+            w = np.nan_to_num(w, nan=0.0)
+            a = a_slow + (a_fast - a_slow) * w
+
+            d = xt - m
+            m = m + a * d
+            v = (1.0 - a) * (v + a * d * d)
+        count += 1
+
+        if count >= min_periods:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                z[t] = (xt - m) / np.sqrt(v)
+
+    state.update(m=m, v=v, m_f=m_f, v_f=v_f, m_s=m_s, v_s=v_s, count=count)
+    z[~np.isfinite(z)] = np.nan
+
+    return z
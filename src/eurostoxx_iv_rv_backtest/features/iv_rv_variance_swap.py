@@ -1,14 +1,130 @@
 # src/eurostoxx_iv_rv_backtest/features/iv_rv_variance_swap.py
 
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
 import pandas as pd
 
+# Hypothèses d'exécution par défaut des scripts (variance notional = 1) :
+# demi-spread 0.25 vol pt + 1 % du niveau de VSTOXX, petit coût de turnover
+VSTOXX_COST_MODEL = {
+    "half_spread_floor": 0.0025,
+    "half_spread_slope": 0.01,
+    "cost_per_turnover": 0.0001,
+}
+
+
+def held_exposure(
+    iv: np.ndarray,
+    rv_fwd: np.ndarray,
+    signal: np.ndarray,
+    notional: float = 1.0,
+    capacity: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Exposition réellement tenue (mêmes shapes que varswap_pnl_matrix) :
+    notional * signal plafonnée à ±capacity, nulle là où on ne trade pas
+    (signal manquant, trous d'IV, fin d'historique sans RV_fwd). C'est sur
+    elle que porte le turnover.
+    """
+    signal = np.nan_to_num(np.asarray(signal, dtype="float64"), nan=0.0)
+    iv = np.asarray(iv, dtype="float64")
+    rv_fwd = np.asarray(rv_fwd, dtype="float64")
+
+    if signal.ndim == 2 and iv.ndim == 1:
+        iv = iv[:, None]
+    if signal.ndim == 2 and rv_fwd.ndim == 1:
+        rv_fwd = rv_fwd[:, None]
+
+    exposure = notional * signal
+    if capacity is not None:
+        exposure = np.clip(exposure, -capacity, capacity)
+
+    return np.where(~np.isnan(iv) & ~np.isnan(rv_fwd), exposure, 0.0)
+
+
+def exposure_turnover(held: np.ndarray) -> np.ndarray:
+    """|exposition_t - exposition_{t-1}| par date, position initiale nulle."""
+    return np.abs(np.diff(held, axis=0, prepend=np.zeros_like(held[:1])))
+
+
+def varswap_pnl_matrix(
+    iv: np.ndarray,
+    rv_fwd: np.ndarray,
+    signal: np.ndarray,
+    notional: float = 1.0,
+    sizing: str = "variance",
+    capacity: Optional[float] = None,
+    half_spread_floor: float = 0.0,
+    half_spread_slope: float = 0.0,
+    cost_per_turnover: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    PnL brut et coûts d'exécution d'un variance swap, en une passe vectorisée.
+
+    signal peut être un vecteur (temps) ou une matrice (temps x ténors, ou
+    temps x paramètres pour un sweep) ; iv / rv_fwd sont alors soit de même
+    shape, soit un vecteur (temps) diffusé sur toutes les colonnes.
+
+    - exposition   : notional * signal, plafonnée à ±capacity (held_exposure)
+    - sizing       : "variance" → unités de variance = exposition
+                     "vega"     → exposition en vega notional, unités de
+                                  variance = exposition / (2 * IV)
+    - bid / ask    : demi-spread en points de vol (décimal) fonction du niveau
+                     de VSTOXX : hs = half_spread_floor + half_spread_slope * IV ;
+                     long vol au strike IV + hs, short vol au strike IV - hs
+    - turnover     : cost_per_turnover * |exposition_t - exposition_{t-1}|,
+                     exposition nulle là où on ne trade pas
+
+    Renvoie (pnl_brut, coût), net = brut - coût. Le signal manquant vaut 0 et
+    on ne trade que là où IV et RV_fwd existent.
+    """
+    held = held_exposure(iv, rv_fwd, signal, notional, capacity)
+    iv = np.asarray(iv, dtype="float64")
+    rv_fwd = np.asarray(rv_fwd, dtype="float64")
+
+    if held.ndim == 2 and iv.ndim == 1:
+        iv = iv[:, None]
+    if held.ndim == 2 and rv_fwd.ndim == 1:
+        rv_fwd = rv_fwd[:, None]
+
+    mask = ~np.isnan(iv) & ~np.isnan(rv_fwd)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if sizing == "variance":
+            units = held
+        elif sizing == "vega":
+            units = held / (2.0 * iv)
+        else:
+            raise ValueError(f"Sizing inconnu : {sizing}")
+
+        gross = units * (rv_fwd**2 - iv**2)
+
+        half_spread = half_spread_floor + half_spread_slope * iv
+        strike = iv + np.sign(units) * half_spread
+        spread_cost = units * (strike**2 - iv**2)
+
+    gross = np.where(mask, gross, 0.0)
+    cost = np.where(mask, spread_cost, 0.0)
+
+    if cost_per_turnover:
+        cost = cost + cost_per_turnover * exposure_turnover(held)
+
+    return gross, cost
+
 
 def backtest_iv_rv_variance_swap(
     df: pd.DataFrame,
-    iv_col: str = "iv",
-    rv_fwd_col: str = "rv_fwd_20d",
-    signal_col: str = "signal_vol",
+    iv_col: Union[str, Sequence[str]] = "iv",
+    rv_fwd_col: Union[str, Sequence[str]] = "rv_fwd_20d",
+    signal_col: Union[str, Sequence[str]] = "signal_vol",
     notional: float = 1.0,
+    labels: Optional[Sequence[str]] = None,
+    sizing: str = "variance",
+    capacity: Optional[float] = None,
+    half_spread_floor: float = 0.0,
+    half_spread_slope: float = 0.0,
+    cost_per_turnover: float = 0.0,
 ) -> pd.DataFrame:
     """
     Backtest jouet type variance swap sur IV vs RV forward.
@@ -18,30 +134,65 @@ def backtest_iv_rv_variance_swap(
     - IV_t       : volatilité implicite (décimal, ex: 0.20)
     - RV_fwd_t   : volatilité réalisée future sur 20 jours (décimal)
     - signal_t   : -1 / 0 / +1 (short / flat / long vol)
+
+    Coûts et sizing (voir varswap_pnl_matrix) : par défaut exécution gratuite
+    et sizing en variance notional, soit le PnL ci-dessus. pnl_varswap est
+    net de coûts ; pnl_varswap_gross et cost_varswap détaillent.
+
+    Mode matriciel : si iv_col / rv_fwd_col / signal_col sont des listes
+    (une entrée par ténor), le PnL est calculé en une passe sur la matrice
+    (temps x ténors) et écrit dans pnl_varswap_{label} / equity_varswap_{label}
+    (labels par défaut = noms des colonnes IV).
     """
 
     df = df.copy()
 
-    for col in (iv_col, rv_fwd_col, signal_col):
+    if isinstance(iv_col, str):
+        iv_cols, rv_cols, sig_cols = [iv_col], [rv_fwd_col], [signal_col]
+    else:
+        iv_cols, rv_cols, sig_cols = list(iv_col), list(rv_fwd_col), list(signal_col)
+        if not (len(iv_cols) == len(rv_cols) == len(sig_cols)):
+            raise ValueError(
+                "iv_col, rv_fwd_col et signal_col doivent avoir la même longueur."
+            )
+
+    for col in (*iv_cols, *rv_cols, *sig_cols):
         if col not in df.columns:
             raise ValueError(f"Colonne manquante pour le backtest : {col}")
 
-    iv = df[iv_col].astype(float)
-    rv_fwd = df[rv_fwd_col].astype(float)
-    signal = df[signal_col].fillna(0.0).astype(float)
+    iv = df[iv_cols].to_numpy(dtype="float64")
+    rv_fwd = df[rv_cols].to_numpy(dtype="float64")
+    signal = df[sig_cols].to_numpy(dtype="float64")
 
-    # Variances
-    var_iv = iv**2
-    var_rv = rv_fwd**2
+    gross, cost = varswap_pnl_matrix(
+        iv,
+        rv_fwd,
+        signal,
+        notional,
+        sizing=sizing,
+        capacity=capacity,
+        half_spread_floor=half_spread_floor,
+        half_spread_slope=half_spread_slope,
+        cost_per_turnover=cost_per_turnover,
+    )
+    pnl = gross - cost
+    equity = pnl.cumsum(axis=0)
 
-    # Série PnL initialisée à 0
-    pnl = pd.Series(0.0, index=df.index)
+    if isinstance(iv_col, str):
+        df["pnl_varswap_gross"] = gross[:, 0]
+        df["cost_varswap"] = cost[:, 0]
+        df["pnl_varswap"] = pnl[:, 0]
+        df["equity_varswap"] = equity[:, 0]
+        return df
 
-    # On ne trade que là où IV et RV_fwd existent
-    mask = iv.notna() & rv_fwd.notna()
-    pnl.loc[mask] = notional * signal.loc[mask] * (var_rv.loc[mask] - var_iv.loc[mask])
+    labels = iv_cols if labels is None else list(labels)
+    if len(labels) != len(iv_cols):
+        raise ValueError("Il faut un label par ténor.")
 
-    df["pnl_varswap"] = pnl
-    df["equity_varswap"] = pnl.cumsum()
+    for j, label in enumerate(labels):
+        df[f"pnl_varswap_gross_{label}"] = gross[:, j]
+        df[f"cost_varswap_{label}"] = cost[:, j]
+        df[f"pnl_varswap_{label}"] = pnl[:, j]
+        df[f"equity_varswap_{label}"] = equity[:, j]
 
     return df
@@ -1,10 +1,60 @@
 # src/eurostoxx_iv_rv_backtest/features/realized_vol.py
 
-from typing import Sequence
+from typing import Sequence, Union
 
 import numpy as np
 import pandas as pd
 
+from eurostoxx_iv_rv_backtest.features.ewma import ewm_mean_var
+
+
+def _rolling_std_matrix(
+    log_ret: np.ndarray,
+    windows: Sequence[int],
+    forward: bool = False,
+) -> np.ndarray:
+    """
+    Écart-type glissant (ddof=1) de 'log_ret' pour plusieurs fenêtres
+    en une seule passe vectorisée (sommes cumulées), shape (n, len(windows)).
+
+    - forward=False : fenêtre [t-w+1 ... t] (équivalent rolling(w).std())
+    - forward=True  : fenêtre [t ... t+w-1] (équivalent reverse/rolling/reverse)
+
+    Une fenêtre contenant un NaN donne NaN, comme pandas (min_periods = w).
+    """
+    x = np.asarray(log_ret, dtype="float64")
+    n = len(x)
+    w = np.asarray(windows, dtype="int64")
+
+    valid = ~np.isnan(x)
+    # On centre pour limiter les erreurs d'annulation (variance invariante)
+    center = x[valid].mean() if valid.any() else 0.0
+    xc = np.where(valid, x - center, 0.0)
+
+    zero = np.zeros(1)
+    c1 = np.concatenate([zero, np.cumsum(xc)])
+    c2 = np.concatenate([zero, np.cumsum(xc * xc)])
+    cn = np.concatenate([zero, np.cumsum(valid)])
+
+    t = np.arange(n)[:, None]
+    if forward:
+        lo, hi = t, t + w[None, :]
+    else:
+        lo, hi = t - w[None, :] + 1, t + 1
+    in_range = (lo >= 0) & (hi <= n)
+    lo = np.clip(lo, 0, n)
+    hi = np.clip(hi, 0, n)
+
+    s1 = c1[hi] - c1[lo]
+    s2 = c2[hi] - c2[lo]
+    full = in_range & ((cn[hi] - cn[lo]) == w[None, :])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (s2 - s1 * s1 / w[None, :]) / (w[None, :] - 1)
+    var = np.maximum(var, 0.0)
+
+    return np.where(full, np.sqrt(var), np.nan)
+
 
 def add_realized_vol(
     df: pd.DataFrame,
@@ -19,21 +69,93 @@ def add_realized_vol(
 
     df["log_ret"] = np.log(df[price_col] / df[price_col].shift(1))
 
-    for w in windows:
+    windows = list(windows)
+    rv = _rolling_std_matrix(df["log_ret"].to_numpy(), windows) * np.sqrt(
+        trading_days_per_year
+    )
+
+    for j, w in enumerate(windows):
         col_rv = f"rv_{w}d"
         col_rv_pct = f"rv_{w}d_pct"
 
-        rolling_std = df["log_ret"].rolling(w).std()
-        df[col_rv] = rolling_std * np.sqrt(trading_days_per_year)
+        df[col_rv] = rv[:, j]
         df[col_rv_pct] = df[col_rv] * 100.0
 
     return df
 
 
+def add_ewma_realized_vol(
+    df: pd.DataFrame,
+    price_col: str = "close",
+    halflives: Sequence[float] = (10, 20),
+    trading_days_per_year: int = 252,
+    min_periods: int = 20,
+) -> pd.DataFrame:
+    """
+    Ajoute une vol réalisée EWMA (type RiskMetrics, moyenne nulle) pour
+    chaque demi-vie, toutes calculées en une passe du filtre récursif :
+
+      rv_ewm_{h}d = sqrt(252 * EWMA_h(log_ret^2))
+
+    Moins de retard qu'une fenêtre glissante de même longueur.
+    """
+    df = df.copy()
+
+    if price_col not in df.columns:
+        raise ValueError(f"Colonne '{price_col}' absente du DataFrame.")
+
+    log_ret = np.log(df[price_col] / df[price_col].shift(1))
+    df["log_ret"] = log_ret
+
+    ew_sq, _ = ewm_mean_var(log_ret.to_numpy() ** 2, halflives, min_periods=min_periods)
+    rv = np.sqrt(ew_sq * trading_days_per_year)
+
+    for j, h in enumerate(halflives):
+        df[f"rv_ewm_{h}d"] = rv[:, j]
+        df[f"rv_ewm_{h}d_pct"] = rv[:, j] * 100.0
+
+    return df
+
+
+def add_intraday_realized_vol(
+    df: pd.DataFrame,
+    var_col: str = "rv_daily_var",
+    overnight_col: str = "overnight_ret",
+    windows: Sequence[int] = (20, 30),
+    trading_days_per_year: int = 252,
+    include_overnight: bool = True,
+) -> pd.DataFrame:
+    """
+    Vol réalisée à partir de variances journalières intraday (voir
+    intraday.stream_intraday_daily_rv), écrite sous les mêmes noms que
+    add_realized_vol (rv_{w}d, rv_{w}d_pct) pour la remplacer telle quelle :
+
+      rv_{w}d = sqrt(252 * moyenne_w(var_intraday + overnight^2))
+
+    var_col="bv_daily_var" donne une version robuste aux sauts (bipower).
+    """
+    df = df.copy()
+
+    for col in (var_col, overnight_col) if include_overnight else (var_col,):
+        if col not in df.columns:
+            raise ValueError(f"Colonne '{col}' absente du DataFrame.")
+
+    daily_var = df[var_col].astype(float)
+    if include_overnight:
+        daily_var = daily_var + df[overnight_col].astype(float) ** 2
+
+    for w in windows:
+        rv = np.sqrt(daily_var.rolling(w).mean() * trading_days_per_year)
+        df[f"rv_{w}d"] = rv
+        df[f"rv_{w}d_pct"] = rv * 100.0
+
+    return df
+
+
 def add_forward_realized_vol(
     df: pd.DataFrame,
     price_col: str = "close",
-    window: int = 20,
+    window: Union[int, Sequence[int]] = 20,
     trading_days_per_year: int = 252,
 ) -> pd.DataFrame:
     """
@@ -42,21 +164,26 @@ def add_forward_realized_vol(
 
     Utile comme RV dans un payoff type variance swap
     (on connaît IV_t, et RV_fwd(t) est la réalisation future).
+
+    'window' peut être une liste d'horizons (ex: un par ténor VSTOXX) :
+    toutes les colonnes rv_fwd_{w}d sont alors calculées en une seule passe.
     """
     df = df.copy()
 
     if price_col not in df.columns:
         raise ValueError(f"Colonne '{price_col}' absente du DataFrame.")
 
+    windows = [int(window)] if np.ndim(window) == 0 else [int(w) for w in window]
+
     log_ret = np.log(df[price_col] / df[price_col].shift(1))
 
-    # On veut une fenêtre "forward": tu peux simplement décaler la série
-    rolling_std_fwd = (
-        log_ret[::-1].rolling(window).std()[::-1]
-    )  # reverse / rolling / reverse trick
+    # Fenêtre "forward" (équivalent du reverse / rolling / reverse trick)
+    rv_fwd = _rolling_std_matrix(log_ret.to_numpy(), windows, forward=True) * np.sqrt(
+        trading_days_per_year
+    )
 
-    rv_fwd = rolling_std_fwd * np.sqrt(trading_days_per_year)
-    df[f"rv_fwd_{window}d"] = rv_fwd
-    df[f"rv_fwd_{window}d_pct"] = rv_fwd * 100.0
+    for j, w in enumerate(windows):
+        df[f"rv_fwd_{w}d"] = rv_fwd[:, j]
+        df[f"rv_fwd_{w}d_pct"] = rv_fwd[:, j] * 100.0
 
     return df
@@ -0,0 +1,135 @@
+# src/eurostoxx_iv_rv_backtest/features/robust.py
+
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# MAD -> sigma pour une loi normale
+MAD_SCALE = 1.4826
+
+# Taille max (lignes x fenêtre) d'un bloc de vues glissantes, pour borner la RAM
+_BLOCK_ELEMS = 4_000_000
+
+
+def _window_blocks(x: np.ndarray, w: int):
+    """
+    Itère sur des blocs de la vue glissante (n - w + 1, w) de x, sans copie
+    de la série entière. Renvoie (indice de fin de la 1re fenêtre, bloc).
+    """
+    view = sliding_window_view(x, w)
+    step = max(1, _BLOCK_ELEMS // w)
+    for start in range(0, len(view), step):
+        yield start + w - 1, view[start : start + step]
+
+
+def rolling_percentile_rank(x: np.ndarray, lookbacks: Sequence[int]) -> np.ndarray:
+    """
+    Rang percentile de x_t dans sa fenêtre [t-w+1 ... t], pour chaque lookback,
+    shape (n, k). Convention « rang moyen » sur les ex-aequo :
+
+      pct_t = (#{x_i < x_t} + 0.5 * #{x_i == x_t}) / w     (dans ]0, 1[)
+
+    Vectorisé par blocs (pas de rolling().apply). NaN si la fenêtre contient un NaN.
+    """
+    x = np.asarray(x, dtype="float64")
+    n = len(x)
+    out = np.full((n, len(lookbacks)), np.nan)
+
+    for j, w in enumerate(lookbacks):
+        if w > n:
+            continue
+        for end, block in _window_blocks(x, w):
+            last = block[:, -1:]
+            less = (block < last).sum(axis=1)
+            equal = (block == last).sum(axis=1)
+            pct = (less + 0.5 * equal) / w
+            pct[np.isnan(block).any(axis=1)] = np.nan
+            out[end : end + len(block), j] = pct
+
+    return out
+
+
+def rolling_robust_zscore(x: np.ndarray, lookbacks: Sequence[int]) -> np.ndarray:
+    """
+    z-score robuste glissant, shape (n, k) :
+
+      z_t = (x_t - médiane_w) / (1.4826 * MAD_w)
+
+    NaN si la fenêtre contient un NaN ou si MAD = 0.
+    """
+    x = np.asarray(x, dtype="float64")
+    n = len(x)
+    out = np.full((n, len(lookbacks)), np.nan)
+
+    for j, w in enumerate(lookbacks):
+        if w > n:
+            continue
+        for end, block in _window_blocks(x, w):
+            med = np.median(block, axis=1)
+            mad = np.median(np.abs(block - med[:, None]), axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                z = (block[:, -1] - med) / (MAD_SCALE * mad)
+            z[~np.isfinite(z)] = np.nan
+            out[end : end + len(block), j] = z
+
+    return out
+
+
+class StreamingRobustWindow:
+    """
+    Fenêtre glissante triée pour le flux (une observation à la fois), mêmes
+    sorties que rolling_percentile_rank et rolling_robust_zscore sur la
+    dernière ligne : NaN tant que la fenêtre n'est pas pleine ou qu'elle
+    contient un NaN.
+
+    Recherche par bisection dans la liste triée : rang percentile en
+    O(log w), médiane lue au milieu de la liste en O(1) ; l'insertion /
+    suppression (décalage de liste) et le MAD restent en O(w).
+    """
+
+    def __init__(self, lookback: int) -> None:
+        if lookback < 2:
+            raise ValueError("Le lookback doit être >= 2.")
+        self.lookback = lookback
+        self._fifo: deque = deque()
+        self._sorted: list = []
+        self._n_nan = 0
+
+    def _median(self) -> float:
+        s, mid = self._sorted, self.lookback // 2
+        if self.lookback % 2:
+            return s[mid]
+        return 0.5 * (s[mid - 1] + s[mid])
+
+    def update(self, x: float) -> Tuple[float, float]:
+        """Ajoute x et renvoie (rang percentile, z robuste) à cette date."""
+        x = float(x)
+        self._fifo.append(x)
+        if np.isnan(x):
+            self._n_nan += 1
+        else:
+            insort(self._sorted, x)
+
+        if len(self._fifo) > self.lookback:
+            old = self._fifo.popleft()
+            if np.isnan(old):
+                self._n_nan -= 1
+            else:
+                del self._sorted[bisect_left(self._sorted, old)]
+
+        if len(self._fifo) < self.lookback or self._n_nan:
+            return np.nan, np.nan
+
+        s = self._sorted
+        less = bisect_left(s, x)
+        equal = bisect_right(s, x) - less
+        pct = (less + 0.5 * equal) / self.lookback
+
+        med = self._median()
+        mad = float(np.median(np.abs(np.asarray(s) - med)))
+        z = (x - med) / (MAD_SCALE * mad) if mad > 0 else np.nan
+
+        return pct, z
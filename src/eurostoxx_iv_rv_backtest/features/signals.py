@@ -0,0 +1,216 @@
+# src/eurostoxx_iv_rv_backtest/features/signals.py
+
+from statistics import NormalDist
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from eurostoxx_iv_rv_backtest.features.ewma import (
+    adaptive_zscore,
+    ewm_zscore,
+    expanding_zscore,
+)
+from eurostoxx_iv_rv_backtest.features.robust import (
+    rolling_percentile_rank,
+    rolling_robust_zscore,
+)
+
+# Méthodes à état récursif (dépendent de toute l'histoire, pas d'une fenêtre)
+RECURSIVE_METHODS = ("expanding", "ewm", "adaptive")
+
+
+def _recursive_zscore(
+    spread: np.ndarray,
+    index: pd.Index,
+    method: str,
+    lookback: int,
+    halflife: float,
+    state: Optional[dict],
+) -> np.ndarray:
+    """
+    z-score des méthodes récursives. Avec 'state', le filtre reprend l'état
+    laissé par l'appel précédent et ne consomme que les lignes d'index
+    > state["last_index"] (NaN sur les lignes déjà traitées).
+    """
+    new = np.ones(len(spread), dtype=bool)
+    if state is not None and "last_index" in state:
+        new = np.asarray(index > state["last_index"])
+    filt = None if state is None else state.setdefault("filter", {})
+
+    x = spread[new]
+    z = np.full(len(spread), np.nan)
+    if method == "expanding":
+        z[new] = expanding_zscore(x, min_periods=lookback, state=filt)
+    elif method == "ewm":
+        z[new] = ewm_zscore(x, [halflife], min_periods=lookback, state=filt)[:, 0]
+    else:
+        z[new] = adaptive_zscore(x, [halflife], min_periods=lookback, state=filt)[:, 0]
+
+    if state is not None and len(index):
+        state["last_index"] = index[-1]
+
+    return z
+
+
+def add_iv_rv_signal(
+    df: pd.DataFrame,
+    iv_col: str = "iv",
+    rv_col: str = "rv_20d",
+    lookback: int = 252,
+    z_entry: float = 0.5,
+    method: str = "rolling",
+    halflife: float = 63,
+    state: Optional[dict] = None,
+) -> pd.DataFrame:
+    """
+    Ajoute :
+      - iv_minus_rv = iv - rv
+      - iv_rv_zscore = (iv_minus_rv - moyenne) / sigma sur 'lookback' jours
+      - signal_vol :
+          +1 = long vol (IV sous-évalue la RV)
+          -1 = short vol (IV surévalue la RV)
+           0 = neutre (écart limité)
+
+    method :
+      - "rolling"   : moyenne / sigma glissants sur 'lookback' jours
+      - "expanding" : toute l'histoire (au moins 'lookback' points)
+      - "ewm"       : filtre exponentiel de demi-vie 'halflife'
+      - "adaptive"  : EWMA dont la mémoire raccourcit en régime agité
+      - "robust"    : (écart - médiane) / (1.4826 * MAD) sur 'lookback' jours
+      - "rank"      : rang percentile sur 'lookback' jours (iv_rv_pct_rank),
+                      seuils Phi(±z_entry) ; pas de colonne iv_rv_zscore
+    Pour les variantes récursives, 'lookback' sert de période de chauffe.
+
+    state : dict (mis à jour en place) pour le calcul incrémental des variantes
+            récursives : df est alors la suite, à index croissant, des appels
+            précédents (les lignes déjà vues peuvent être répétées pour les
+            fenêtres finies, le filtre les ignore). Sans effet pour les
+            méthodes à fenêtre finie.
+    """
+
+    df = df.copy()
+
+    if iv_col not in df.columns or rv_col not in df.columns:
+        raise ValueError("Colonnes IV/RV manquantes pour le signal.")
+
+    # Écart IV - RV (en vol annualisée)
+    df["iv_minus_rv"] = df[iv_col] - df[rv_col]
+
+    spread = df["iv_minus_rv"].to_numpy(dtype="float64")
+
+    if method == "rolling":
+        # Stats glissantes sur l'écart
+        rolling_mean = df["iv_minus_rv"].rolling(lookback).mean()
+        rolling_std = df["iv_minus_rv"].rolling(lookback).std()
+
+        df["iv_rv_zscore"] = (df["iv_minus_rv"] - rolling_mean) / rolling_std
+    elif method in RECURSIVE_METHODS:
+        df["iv_rv_zscore"] = _recursive_zscore(
+            spread, df.index, method, lookback, halflife, state
+        )
+    elif method == "robust":
+        df["iv_rv_zscore"] = rolling_robust_zscore(spread, [lookback])[:, 0]
+    elif method == "rank":
+        df["iv_rv_pct_rank"] = rolling_percentile_rank(spread, [lookback])[:, 0]
+    else:
+        raise ValueError(f"Méthode de z-score inconnue : {method}")
+
+    # Signal discret : +1 / -1 / 0
+    if method == "rank":
+        # Seuils de rang équivalents à ±z_entry sous une loi normale
+        p_entry = NormalDist().cdf(z_entry)
+        pct = df["iv_rv_pct_rank"]
+        signal = pd.Series(0, index=df.index, dtype="int64")
+        signal = signal.mask(pct > p_entry, -1)  # IV >> RV → short vol
+        signal = signal.mask(pct < 1.0 - p_entry, 1)  # IV << RV → long vol
+    else:
+        z = df["iv_rv_zscore"]
+        signal = pd.Series(0, index=df.index, dtype="int64")
+        signal = signal.mask(z > z_entry, -1)  # IV >> RV → short vol
+        signal = signal.mask(z < -z_entry, 1)  # IV << RV → long vol
+
+    df["signal_vol"] = signal
+
+    return df
+
+
+def add_iv_rv_signal_bank(
+    df: pd.DataFrame,
+    iv_col: str = "iv",
+    rv_col: str = "rv_20d",
+    halflives: Sequence[float] = (21, 63, 126, 252),
+    z_entry: float = 0.5,
+    method: str = "ewm",
+    min_periods: int = 63,
+) -> pd.DataFrame:
+    """
+    Banque de signaux IV-RV récursifs, toutes demi-vies en un seul appel O(n·k) :
+      - iv_rv_zscore_{method}{h}
+      - signal_vol_{method}{h} (+1 / -1 / 0, même convention que add_iv_rv_signal)
+
+    method = "ewm" ou "adaptive".
+    """
+
+    df = df.copy()
+
+    if iv_col not in df.columns or rv_col not in df.columns:
+        raise ValueError("Colonnes IV/RV manquantes pour le signal.")
+
+    df["iv_minus_rv"] = df[iv_col] - df[rv_col]
+    spread = df["iv_minus_rv"].to_numpy(dtype="float64")
+
+    if method == "ewm":
+        z = ewm_zscore(spread, halflives, min_periods=min_periods)
+    elif method == "adaptive":
+        z = adaptive_zscore(spread, halflives, min_periods=min_periods)
+    else:
+        raise ValueError(f"Méthode de banque inconnue : {method}")
+
+    signal = np.where(z > z_entry, -1, np.where(z < -z_entry, 1, 0))
+
+    for j, h in enumerate(halflives):
+        df[f"iv_rv_zscore_{method}{h}"] = z[:, j]
+        df[f"signal_vol_{method}{h}"] = signal[:, j].astype("int64")
+
+    return df
+
+
+def add_iv_rv_robust_bank(
+    df: pd.DataFrame,
+    iv_col: str = "iv",
+    rv_col: str = "rv_20d",
+    lookbacks: Sequence[int] = (63, 126, 252, 504),
+    z_entry: float = 0.5,
+) -> pd.DataFrame:
+    """
+    Signaux IV-RV robustes aux queues épaisses, pour plusieurs lookbacks :
+      - iv_rv_pct_rank_{w}  : rang percentile de l'écart sur w jours
+      - iv_rv_robust_z_{w}  : (écart - médiane) / (1.4826 * MAD)
+      - signal_vol_rank{w} / signal_vol_robust{w} (+1 / -1 / 0)
+
+    Même convention de seuils que add_iv_rv_signal(method="rank" / "robust").
+    """
+
+    df = df.copy()
+
+    if iv_col not in df.columns or rv_col not in df.columns:
+        raise ValueError("Colonnes IV/RV manquantes pour le signal.")
+
+    df["iv_minus_rv"] = df[iv_col] - df[rv_col]
+    spread = df["iv_minus_rv"].to_numpy(dtype="float64")
+
+    pct = rolling_percentile_rank(spread, lookbacks)
+    z = rolling_robust_zscore(spread, lookbacks)
+
+    p_entry = NormalDist().cdf(z_entry)
+    signal_rank = np.where(pct > p_entry, -1, np.where(pct < 1.0 - p_entry, 1, 0))
+    signal_robust = np.where(z > z_entry, -1, np.where(z < -z_entry, 1, 0))
+
+    for j, w in enumerate(lookbacks):
+        df[f"iv_rv_pct_rank_{w}"] = pct[:, j]
+        df[f"iv_rv_robust_z_{w}"] = z[:, j]
+        df[f"signal_vol_rank{w}"] = signal_rank[:, j].astype("int64")
+        df[f"signal_vol_robust{w}"] = signal_robust[:, j].astype("int64")
+
+    return df
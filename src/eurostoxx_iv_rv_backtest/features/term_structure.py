@@ -0,0 +1,201 @@
+# src/eurostoxx_iv_rv_backtest/features/term_structure.py
+
+from typing import Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from eurostoxx_iv_rv_backtest.features.iv_rv_variance_swap import (
+    backtest_iv_rv_variance_swap,
+    varswap_pnl_matrix,
+)
+from eurostoxx_iv_rv_backtest.features.realized_vol import (
+    add_forward_realized_vol,
+    add_realized_vol,
+)
+
+# Sous-indices VSTOXX (V6I1 ... V6I8) : ténor -> horizon en jours de bourse
+VSTOXX_TENORS = {
+    "1m": 21,
+    "2m": 42,
+    "3m": 63,
+    "6m": 126,
+    "9m": 189,
+    "12m": 252,
+    "18m": 378,
+    "24m": 504,
+}
+
+
+def _adjacent_spreads(tenors: Sequence[str]) -> Tuple[Tuple[str, str], ...]:
+    """Spreads calendaires par défaut : ténors consécutifs (1m/2m, 2m/3m, ...)."""
+    return tuple(zip(tenors[:-1], tenors[1:]))
+
+
+def add_term_structure_rv(
+    df: pd.DataFrame,
+    tenors: Mapping[str, int] = VSTOXX_TENORS,
+    price_col: str = "close",
+    trading_days_per_year: int = 252,
+) -> pd.DataFrame:
+    """
+    Ajoute, pour chaque horizon de la courbe, la RV passée rv_{h}d (signal)
+    et la RV forward rv_fwd_{h}d (payoff), chacune en une seule passe.
+    """
+    horizons = sorted(set(tenors.values()))
+
+    df = add_realized_vol(
+        df,
+        price_col=price_col,
+        windows=horizons,
+        trading_days_per_year=trading_days_per_year,
+    )
+    df = add_forward_realized_vol(
+        df,
+        price_col=price_col,
+        window=horizons,
+        trading_days_per_year=trading_days_per_year,
+    )
+
+    return df
+
+
+def add_term_structure_signals(
+    df: pd.DataFrame,
+    tenors: Mapping[str, int] = VSTOXX_TENORS,
+    lookback: int = 252,
+    z_entry: float = 0.5,
+    spreads: Optional[Sequence[Tuple[str, str]]] = None,
+) -> pd.DataFrame:
+    """
+    Version matricielle de add_iv_rv_signal sur toute la courbe.
+
+    Pour chaque ténor t (IV = iv_{t}, RV = rv_{h}d) :
+      - iv_minus_rv_{t}, iv_rv_zscore_{t}, signal_vol_{t} (+1 / -1 / 0)
+
+    Pour chaque spread calendaire (a, b) :
+      - cal_zscore_{a}_{b} = zscore_a - zscore_b
+      - signal_cal_{a}_{b} : position sur la jambe a (la jambe b est opposée)
+          -1 = a riche vs b → short a / long b
+          +1 = a bon marché vs b → long a / short b
+    """
+    df = df.copy()
+
+    names = list(tenors)
+    iv_cols = [f"iv_{t}" for t in names]
+    rv_cols = [f"rv_{tenors[t]}d" for t in names]
+
+    missing = [c for c in (*iv_cols, *rv_cols) if c not in df.columns]
+    if missing:
+        raise ValueError(f"Colonnes IV/RV manquantes pour la courbe : {missing}")
+
+    # Écarts IV - RV, stats glissantes calculées sur toutes les colonnes à la fois
+    spread = pd.DataFrame(
+        df[iv_cols].to_numpy(dtype="float64") - df[rv_cols].to_numpy(dtype="float64"),
+        index=df.index,
+        columns=names,
+    )
+    rolling = spread.rolling(lookback)
+    z = ((spread - rolling.mean()) / rolling.std()).to_numpy()
+
+    signal = np.where(z > z_entry, -1, np.where(z < -z_entry, 1, 0))
+
+    for j, t in enumerate(names):
+        df[f"iv_minus_rv_{t}"] = spread[t]
+        df[f"iv_rv_zscore_{t}"] = z[:, j]
+        df[f"signal_vol_{t}"] = signal[:, j].astype("int64")
+
+    if spreads is None:
+        spreads = _adjacent_spreads(names)
+
+    for a, b in spreads:
+        cal_z = df[f"iv_rv_zscore_{a}"] - df[f"iv_rv_zscore_{b}"]
+        cal_signal = pd.Series(0, index=df.index, dtype="int64")
+        cal_signal = cal_signal.mask(cal_z > z_entry, -1)
+        cal_signal = cal_signal.mask(cal_z < -z_entry, 1)
+
+        df[f"cal_zscore_{a}_{b}"] = cal_z
+        df[f"signal_cal_{a}_{b}"] = cal_signal
+
+    return df
+
+
+def backtest_term_structure(
+    df: pd.DataFrame,
+    tenors: Mapping[str, int] = VSTOXX_TENORS,
+    notional: float = 1.0,
+    spreads: Optional[Sequence[Tuple[str, str]]] = None,
+    sizing: str = "variance",
+    capacity: Optional[float] = None,
+    half_spread_floor: float = 0.0,
+    half_spread_slope: float = 0.0,
+    cost_per_turnover: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Backtest variance swap sur toute la courbe :
+      - pnl_varswap_{t} / equity_varswap_{t} pour chaque ténor
+      - pnl_cal_{a}_{b} / equity_cal_{a}_{b} pour chaque spread calendaire,
+        jambe a = signal, jambe b = -signal (même notional)
+
+    Coûts et sizing comme backtest_iv_rv_variance_swap, appliqués à chaque
+    jambe : les PnL sont nets, pnl_*_gross et cost_* détaillent. Le spread
+    ne trade que si les deux jambes ont IV et RV_fwd.
+    """
+    cost_kwargs = dict(
+        sizing=sizing,
+        capacity=capacity,
+        half_spread_floor=half_spread_floor,
+        half_spread_slope=half_spread_slope,
+        cost_per_turnover=cost_per_turnover,
+    )
+    names = list(tenors)
+
+    df = backtest_iv_rv_variance_swap(
+        df,
+        iv_col=[f"iv_{t}" for t in names],
+        rv_fwd_col=[f"rv_fwd_{tenors[t]}d" for t in names],
+        signal_col=[f"signal_vol_{t}" for t in names],
+        notional=notional,
+        labels=names,
+        **cost_kwargs,
+    )
+
+    if spreads is None:
+        spreads = _adjacent_spreads(names)
+    if not spreads:
+        return df
+
+    legs_a = [a for a, _ in spreads]
+    legs_b = [b for _, b in spreads]
+    sig_cols = [f"signal_cal_{a}_{b}" for a, b in spreads]
+
+    missing = [c for c in sig_cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"Signaux calendaires manquants : {missing}")
+
+    def _leg(cols: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        iv = df[[f"iv_{t}" for t in cols]].to_numpy(dtype="float64")
+        rv = df[[f"rv_fwd_{tenors[t]}d" for t in cols]].to_numpy(dtype="float64")
+        return iv, rv
+
+    iv_a, rv_a = _leg(legs_a)
+    iv_b, rv_b = _leg(legs_b)
+    signal = df[sig_cols].to_numpy(dtype="float64")
+
+    both = ~np.isnan(iv_a) & ~np.isnan(rv_a) & ~np.isnan(iv_b) & ~np.isnan(rv_b)
+    signal = np.where(both, np.nan_to_num(signal, nan=0.0), 0.0)
+
+    gross_a, cost_a = varswap_pnl_matrix(iv_a, rv_a, signal, notional, **cost_kwargs)
+    gross_b, cost_b = varswap_pnl_matrix(iv_b, rv_b, -signal, notional, **cost_kwargs)
+    gross = gross_a + gross_b
+    cost = cost_a + cost_b
+    pnl = gross - cost
+    equity = pnl.cumsum(axis=0)
+
+    for j, (a, b) in enumerate(spreads):
+        df[f"pnl_cal_gross_{a}_{b}"] = gross[:, j]
+        df[f"cost_cal_{a}_{b}"] = cost[:, j]
+        df[f"pnl_cal_{a}_{b}"] = pnl[:, j]
+        df[f"equity_cal_{a}_{b}"] = equity[:, j]
+
+    return df
@@ -0,0 +1,208 @@
+# src/eurostoxx_iv_rv_backtest/intraday.py
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DAILY_COLUMNS = [
+    "date",
+    "close",
+    "rv_daily_var",
+    "bv_daily_var",
+    "overnight_ret",
+    "n_bars",
+]
+
+# Fuseau de la place (Eurex / STOXX) : les journées sont découpées en heure locale
+EXCHANGE_TZ = "Europe/Berlin"
+
+
+def _exchange_time(values: pd.Series, tz: str) -> pd.Series:
+    """
+    Horodatages naïfs en heure locale de la place : les horodatages avec
+    fuseau (UTC, décalages mixtes au changement d'heure) sont convertis dans
+    'tz' ; les naïfs sont supposés déjà en heure locale.
+    """
+    try:
+        ts = pd.to_datetime(values)
+    except ValueError:
+        ts = None  # décalages UTC mixtes (pandas >= 3)
+    if ts is None or ts.dtype == object:
+        ts = pd.to_datetime(values, utc=True)
+
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert(tz).dt.tz_localize(None)
+    return ts
+
+
+def _day_stats(
+    chunk: pd.DataFrame,
+    state: Dict,
+    ts_col: str,
+    close_col: str,
+    open_col: Optional[str],
+    tz: str = EXCHANGE_TZ,
+) -> pd.DataFrame:
+    """
+    Agrégats journaliers d'un chunk de barres (vectorisé), en tenant compte
+    de la dernière barre du chunk précédent (state) :
+
+      - rv_daily_var : somme des r_i^2 intraday
+      - bv_daily_var : (pi/2) * somme |r_i| |r_{i-1}| (bipower variation)
+      - overnight_ret: log(open_1 / close_veille) (ou close_1 si pas d'open)
+    """
+    chunk = chunk.dropna(subset=[close_col])
+    ts = _exchange_time(chunk[ts_col], tz)
+
+    t = ts.to_numpy()
+    if len(t) and (
+        (np.diff(t) < np.timedelta64(0)).any()
+        or (not pd.isna(state["prev_ts"]) and t[0] < state["prev_ts"])
+    ):
+        raise ValueError("Les barres intraday doivent être triées par horodatage.")
+
+    day = ts.dt.normalize().to_numpy()
+    close = chunk[close_col].to_numpy(dtype="float64")
+
+    prev_close = np.concatenate([[state["prev_close"]], close[:-1]])
+    prev_day = np.concatenate(
+        [np.array([state["prev_day"]], dtype=day.dtype), day[:-1]]
+    )
+    new_day = day != prev_day
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if open_col is not None:
+            open_ = chunk[open_col].to_numpy(dtype="float64")
+            intraday = np.where(
+                new_day, np.log(close / open_), np.log(close / prev_close)
+            )
+            overnight = np.where(new_day, np.log(open_ / prev_close), np.nan)
+        else:
+            intraday = np.where(new_day, np.nan, np.log(close / prev_close))
+            overnight = np.where(new_day, np.log(close / prev_close), np.nan)
+
+    abs_r = np.abs(intraday)
+    prev_abs = np.concatenate([[state["prev_abs_r"]], abs_r[:-1]])
+    prev_abs = np.where(new_day, np.nan, prev_abs)
+
+    if len(t):
+        state["prev_close"] = close[-1]
+        state["prev_day"] = day[-1]
+        state["prev_abs_r"] = abs_r[-1]
+        state["prev_ts"] = t[-1]
+
+    return (
+        pd.DataFrame(
+            {
+                "date": day,
+                "close": close,
+                "rv_daily_var": intraday**2,
+                "bv_daily_var": (np.pi / 2.0) * abs_r * prev_abs,
+                "overnight_ret": overnight,
+                "n_bars": 1,
+            }
+        )
+        .groupby("date", sort=False)
+        .agg(
+            close=("close", "last"),
+            rv_daily_var=("rv_daily_var", "sum"),
+            bv_daily_var=("bv_daily_var", "sum"),
+            overnight_ret=("overnight_ret", "first"),
+            n_bars=("n_bars", "sum"),
+        )
+        .reset_index()
+    )
+
+
+def _merge_pending(pending: Optional[pd.DataFrame], days: pd.DataFrame) -> pd.DataFrame:
+    """Recolle la journée coupée entre deux chunks (même date en bordure)."""
+    if pending is None or days.empty or pending["date"].iloc[0] != days["date"].iloc[0]:
+        return (
+            days if pending is None else pd.concat([pending, days], ignore_index=True)
+        )
+
+    first = days.iloc[0].copy()
+    for col in ("rv_daily_var", "bv_daily_var", "n_bars"):
+        first[col] = pending[col].iloc[0] + first[col]
+    first["overnight_ret"] = pending["overnight_ret"].iloc[0]
+
+    days = days.copy()
+    days.iloc[0] = first
+    return days
+
+
+def iter_daily_realized_variance(
+    chunks: Iterable[pd.DataFrame],
+    ts_col: str = "datetime",
+    close_col: str = "close",
+    open_col: Optional[str] = "open",
+    tz: str = EXCHANGE_TZ,
+) -> Iterable[pd.DataFrame]:
+    """
+    Générateur : agrège un flux de chunks de barres intraday (triés) en
+    journées complètes. Seule la dernière journée (incomplète) d'un chunk
+    est gardée en mémoire : mémoire constante quelle que soit la taille du flux.
+    """
+    state = {
+        "prev_close": np.nan,
+        "prev_day": np.datetime64("NaT", "ns"),
+        "prev_abs_r": np.nan,
+        "prev_ts": np.datetime64("NaT", "ns"),
+    }
+    pending: Optional[pd.DataFrame] = None
+
+    for chunk in chunks:
+        days = _day_stats(chunk, state, ts_col, close_col, open_col, tz)
+        days = _merge_pending(pending, days)
+        if days.empty:
+            continue
+
+        pending = days.iloc[[-1]].reset_index(drop=True)
+        if len(days) > 1:
+            yield days.iloc[:-1].reset_index(drop=True)
+
+    if pending is not None:
+        yield pending
+
+
+def stream_intraday_daily_rv(
+    path: Path,
+    ts_col: str = "datetime",
+    close_col: str = "close",
+    open_col: Optional[str] = "open",
+    chunksize: int = 1_000_000,
+    output_path: Optional[Path] = None,
+    tz: str = EXCHANGE_TZ,
+) -> pd.DataFrame:
+    """
+    Lit un fichier de barres 1min / 5min (CSV, potentiellement plusieurs Go)
+    par chunks et produit un frame journalier :
+
+      date, close, rv_daily_var, bv_daily_var, overnight_ret, n_bars
+
+    Les variances sont journalières (non annualisées). Les journées sont
+    découpées en heure locale de la place ('tz') : horodatages naïfs pris
+    tels quels, horodatages avec fuseau convertis. Si output_path est fourni,
+    les journées sont écrites au fil de l'eau.
+    """
+    usecols = [ts_col, close_col] + ([open_col] if open_col else [])
+    reader = pd.read_csv(path, usecols=usecols, chunksize=chunksize)
+
+    parts: List[pd.DataFrame] = []
+    header = True
+
+    for days in iter_daily_realized_variance(reader, ts_col, close_col, open_col, tz):
+        days = days[DAILY_COLUMNS]
+        parts.append(days)
+        if output_path is not None:
+            days.to_csv(
+                output_path, mode="w" if header else "a", header=header, index=False
+            )
+            header = False
+
+    if not parts:
+        return pd.DataFrame(columns=DAILY_COLUMNS)
+
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,214 @@
+# src/eurostoxx_iv_rv_backtest/lookahead.py
+
+import inspect
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from eurostoxx_iv_rv_backtest.features.realized_vol import (
+    add_forward_realized_vol,
+    add_realized_vol,
+)
+from eurostoxx_iv_rv_backtest.features.signals import add_iv_rv_signal
+
+SignalFn = Callable[[pd.DataFrame], pd.DataFrame]
+
+# Colonnes contrôlées par défaut (sorties de add_iv_rv_signal)
+DEFAULT_AUDIT_COLUMNS = ("iv_minus_rv", "iv_rv_zscore", "signal_vol")
+
+
+def default_signal_pipeline(
+    df: pd.DataFrame,
+    method: str = "rolling",
+    state: Optional[dict] = None,
+) -> pd.DataFrame:
+    """
+    Pipeline build_rv + build_signals à partir des colonnes brutes
+    (close, iv) : RV passée, RV forward (payoff), puis signal IV-RV
+    (method : voir add_iv_rv_signal ; functools.partial pour la choisir).
+
+    La RV forward est volontairement incluse : si un signal la lit par
+    erreur, sa valeur change dès qu'on tronque l'historique.
+
+    state : état des filtres récursifs, porté d'un cut-off au suivant par le
+            rejeu (voir replay_lookahead_audit).
+    """
+    df = add_realized_vol(df, price_col="close", windows=(20, 30))
+    df = add_forward_realized_vol(df, price_col="close", window=20)
+    return add_iv_rv_signal(
+        df, iv_col="iv", rv_col="rv_20d", lookback=252, method=method, state=state
+    )
+
+
+def _accepts_state(signal_fn: SignalFn) -> bool:
+    """Vrai si signal_fn accepte un argument 'state' (rejeu incrémental)."""
+    try:
+        return "state" in inspect.signature(signal_fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+_WORKER: Dict = {}
+
+
+def _init_worker(df: pd.DataFrame, signal_fn: SignalFn) -> None:
+    """Initializer : l'historique n'est envoyé qu'une fois par process."""
+    _WORKER.update(df=df, signal_fn=signal_fn)
+
+
+def _replay_group(
+    cutoffs: Sequence[int],
+    columns: Sequence[str],
+    warmup: Optional[int],
+    df: Optional[pd.DataFrame] = None,
+    signal_fn: Optional[SignalFn] = None,
+) -> np.ndarray:
+    """
+    Rejoue un groupe de cut-offs croissants et renvoie la matrice
+    (len(cutoffs), len(columns)) des valeurs du signal à chaque cut-off,
+    calculées sans aucune donnée postérieure.
+
+    Avec 'warmup', seule la queue des 'warmup' lignes précédant chaque
+    cut-off est rejouée : l'état des fenêtres finies ne dépend que d'elle.
+    Si signal_fn accepte 'state', l'état des filtres récursifs est porté
+    d'un cut-off au suivant : le premier cut-off du groupe part du début de
+    l'historique, les suivants rejouent la queue depuis le cut-off précédent
+    (moins 'warmup' lignes), et les filtres ne consomment que les lignes
+    nouvelles. Chaque rejeu coûte alors O(warmup + écart entre cut-offs).
+    """
+    df = _WORKER["df"] if df is None else df
+    signal_fn = _WORKER["signal_fn"] if signal_fn is None else signal_fn
+    stateful = _accepts_state(signal_fn)
+
+    out = np.full((len(cutoffs), len(columns)), np.nan)
+    state: dict = {}
+    prev = None
+    for k, c in enumerate(cutoffs):
+        if stateful:
+            start = 0 if warmup is None or prev is None else prev + 1 - warmup
+            replay = signal_fn(df.iloc[max(0, start) : c + 1], state=state)
+            prev = c
+        else:
+            start = 0 if warmup is None else max(0, c + 1 - warmup)
+            replay = signal_fn(df.iloc[start : c + 1])
+        out[k] = replay[list(columns)].iloc[-1].to_numpy(dtype="float64")
+
+    return out
+
+
+def sample_cutoffs(n_rows: int, n_cutoffs: int = 64, min_row: int = 0) -> np.ndarray:
+    """Cut-offs répartis uniformément sur [min_row, n_rows - 1] (triés, uniques)."""
+    if n_rows <= min_row:
+        return np.array([], dtype="int64")
+    return np.unique(
+        np.linspace(min_row, n_rows - 1, num=min(n_cutoffs, n_rows - min_row))
+        .round()
+        .astype("int64")
+    )
+
+
+def replay_lookahead_audit(
+    df: pd.DataFrame,
+    signal_fn: SignalFn = default_signal_pipeline,
+    columns: Sequence[str] = DEFAULT_AUDIT_COLUMNS,
+    cutoffs: Optional[Sequence[int]] = None,
+    n_cutoffs: int = 64,
+    warmup: Optional[int] = 300,
+    n_workers: Optional[int] = None,
+    atol: float = 1e-9,
+) -> pd.DataFrame:
+    """
+    Audit de look-ahead par rejeu à origine glissante.
+
+    Pour chaque cut-off c (position de ligne), le signal est recalculé sur
+    l'historique tronqué à c et comparé à la valeur du calcul sur tout
+    l'historique. Un signal causal donne la même valeur ; tout écart
+    signale l'usage d'une donnée future.
+
+    - signal_fn : DataFrame brut -> DataFrame avec les colonnes à contrôler
+                  (fonction de module ou partial, picklable, pour le mode
+                  parallèle). Si elle accepte un argument 'state' (voir
+                  default_signal_pipeline), l'état de ses filtres récursifs
+                  (ewm / adaptive / expanding) est porté entre cut-offs.
+    - warmup    : nb de lignes d'historique gardées avant chaque cut-off ;
+                  doit couvrir toutes les fenêtres finies du pipeline (300
+                  pour RV 20j + lookback 252). None = préfixe complet, O(n)
+                  par cut-off : seul mode exact pour un signal_fn récursif
+                  qui n'accepte pas 'state'.
+    - n_workers : groupes de cut-offs contigus rejoués en parallèle ; 1 = local
+
+    Renvoie un rapport (une ligne par cut-off x colonne) : cutoff, date,
+    column, full, replay, ok.
+    """
+    df = df.reset_index(drop=True)
+    columns = list(columns)
+
+    full = signal_fn(df)
+    missing = [c for c in columns if c not in full.columns]
+    if missing:
+        raise ValueError(f"Colonnes absentes de la sortie du signal : {missing}")
+
+    if cutoffs is None:
+        min_row = 0 if warmup is None else min(warmup, len(df)) - 1
+        cutoffs = sample_cutoffs(len(df), n_cutoffs, min_row=max(min_row, 0))
+    cutoffs = np.unique(np.asarray(cutoffs, dtype="int64"))
+
+    if n_workers == 1 or len(cutoffs) <= 1:
+        replay = _replay_group(cutoffs, columns, warmup, df=df, signal_fn=signal_fn)
+    else:
+        groups: List[np.ndarray] = [
+            g for g in np.array_split(cutoffs, n_workers or 8) if len(g)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(df, signal_fn),
+        ) as pool:
+            parts = list(
+                pool.map(
+                    _replay_group,
+                    groups,
+                    [columns] * len(groups),
+                    [warmup] * len(groups),
+                )
+            )
+        replay = np.vstack(parts)
+
+    full_vals = full[columns].to_numpy(dtype="float64")[cutoffs]
+
+    both_nan = np.isnan(full_vals) & np.isnan(replay)
+    with np.errstate(invalid="ignore"):
+        close = np.abs(full_vals - replay) <= atol
+    ok = both_nan | close
+
+    dates = (
+        df["date"].to_numpy()[cutoffs]
+        if "date" in df.columns
+        else [pd.NaT] * len(cutoffs)
+    )
+
+    return pd.DataFrame(
+        {
+            "cutoff": np.repeat(cutoffs, len(columns)),
+            "date": np.repeat(dates, len(columns)),
+            "column": np.tile(columns, len(cutoffs)),
+            "full": full_vals.ravel(),
+            "replay": replay.ravel(),
+            "ok": ok.ravel(),
+        }
+    )
+
+
+def check_no_lookahead(report: pd.DataFrame) -> None:
+    """Lève une RuntimeError si le rapport d'audit contient des écarts."""
+    bad = report.loc[~report["ok"]]
+    if bad.empty:
+        return
+
+    cols = sorted(bad["column"].unique())
+    raise RuntimeError(
+        f"Look-ahead détecté sur {bad['cutoff'].nunique()} cut-off(s), "
+        f"colonnes {cols}. Premiers écarts :\n{bad.head(10)}"
+    )
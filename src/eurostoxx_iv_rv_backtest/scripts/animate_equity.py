@@ -1,9 +1,8 @@
 # src/eurostoxx_iv_rv_backtest/scripts/animate_equity.py
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from eurostoxx_iv_rv_backtest.alignment import ensure_sorted
 from eurostoxx_iv_rv_backtest.config import OUTPUTS
 
 
@@ -17,6 +16,10 @@ def plot_equity(show_regimes: bool = True) -> None:
       rouge = short vol, bleu = long vol
     """
 
+    # Import paresseux : matplotlib n'est chargé que pour tracer
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+
     csv_path = OUTPUTS / "SXE50_iv_rv_varswap_backtest.csv"
     if not csv_path.exists():
         raise FileNotFoundError(
@@ -24,11 +27,7 @@ def plot_equity(show_regimes: bool = True) -> None:
         )
 
     print(f">>> Lecture de {csv_path}")
-    df = (
-        pd.read_csv(csv_path, parse_dates=["date"])
-        .sort_values("date")
-        .reset_index(drop=True)
-    )
+    df = ensure_sorted(pd.read_csv(csv_path, parse_dates=["date"]))
 
     required_cols = ["date", "equity_varswap"]
     for c in required_cols:
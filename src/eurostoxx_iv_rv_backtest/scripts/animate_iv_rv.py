@@ -1,10 +1,8 @@
 # src/eurostoxx_iv_rv_backtest/scripts/animate_iv_rv.py
 #
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import pandas as pd
-from matplotlib.animation import FuncAnimation
 
+from eurostoxx_iv_rv_backtest.alignment import ensure_sorted
 from eurostoxx_iv_rv_backtest.config import OUTPUTS
 
 
@@ -19,6 +17,11 @@ def main() -> None:
         bleu  = IV < RV  → régime "long vol"
     """
 
+    # Import paresseux : matplotlib n'est chargé que pour tracer
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
     csv_path = OUTPUTS / "SXE50_with_IV_RV_daily_20y.csv"
     if not csv_path.exists():
         raise FileNotFoundError(
@@ -28,7 +31,7 @@ def main() -> None:
 
     print(f">>> Lecture de {csv_path}")
     df = pd.read_csv(csv_path, parse_dates=["date"])
-    df = df.sort_values("date").reset_index(drop=True)
+    df = ensure_sorted(df)
 
     # x = dates, y1 = IV en %, y2 = RV 20j en %
     x = df["date"]
@@ -0,0 +1,61 @@
+# src/eurostoxx_iv_rv_backtest/scripts/audit_lookahead.py
+
+from functools import partial
+
+import pandas as pd
+
+from eurostoxx_iv_rv_backtest.alignment import ensure_sorted
+from eurostoxx_iv_rv_backtest.config import DATA_RAW
+from eurostoxx_iv_rv_backtest.lookahead import (
+    DEFAULT_AUDIT_COLUMNS,
+    check_no_lookahead,
+    default_signal_pipeline,
+    replay_lookahead_audit,
+)
+
+# Variantes du z-score auditées (les récursives via l'état porté du rejeu)
+AUDIT_METHODS = ("rolling", "expanding", "ewm", "adaptive", "robust", "rank")
+
+
+def main() -> None:
+    """
+    Vérifie que le pipeline RV + signal IV-RV (chaque variante du z-score)
+    n'utilise aucune donnée future, par rejeu sur historiques tronqués
+    (à lancer après chaque modif du signal).
+    """
+
+    input_path = DATA_RAW / "SXE50_with_IV_daily_20y.csv"
+
+    if not input_path.exists():
+        raise FileNotFoundError(
+            f"Fichier d'entrée introuvable : {input_path}\n"
+            "Tu as bien lancé data/raw/getdata.py avant ?"
+        )
+
+    print(f">>> Lecture de {input_path}")
+    df = ensure_sorted(pd.read_csv(input_path, parse_dates=["date"]))
+
+    for method in AUDIT_METHODS:
+        report = replay_lookahead_audit(
+            df[["date", "close", "iv"]],
+            signal_fn=partial(default_signal_pipeline, method=method),
+            columns=(
+                ("iv_minus_rv", "iv_rv_pct_rank", "signal_vol")
+                if method == "rank"
+                else DEFAULT_AUDIT_COLUMNS
+            ),
+            n_cutoffs=256,
+            warmup=300,
+        )
+
+        n_cut = report["cutoff"].nunique()
+        n_bad = int((~report["ok"]).sum())
+        print(f">>> {method:<9} : {n_cut} cut-offs rejoués, {n_bad} écart(s)")
+
+        check_no_lookahead(report)
+
+    print("\n✅ Aucun look-ahead détecté.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# src/eurostoxx_iv_rv_backtest/scripts/build_intraday_rv.py
+
+from eurostoxx_iv_rv_backtest.config import DATA_RAW, ensure_dirs
+from eurostoxx_iv_rv_backtest.intraday import stream_intraday_daily_rv
+
+
+def main() -> None:
+    """
+    Agrège les barres intraday SX5E (CSV datetime, open, close, ...) en
+    variance réalisée journalière, sans charger le fichier en entier, et écrit :
+
+      data/raw/SXE50_intraday_daily_rv.csv
+
+    build_rv.py utilise ensuite ce fichier à la place de la RV close-to-close.
+    """
+
+    input_path = DATA_RAW / "SXE50_intraday_bars.csv"
+    output_path = DATA_RAW / "SXE50_intraday_daily_rv.csv"
+
+    if not input_path.exists():
+        raise FileNotFoundError(
+            f"Fichier d'entrée introuvable : {input_path}\n"
+            "Il faut un fichier de barres 1min / 5min (colonnes datetime, open, close)."
+        )
+
+    print(f">>> Lecture par chunks de {input_path}")
+    ensure_dirs()
+    daily = stream_intraday_daily_rv(
+        input_path,
+        ts_col="datetime",
+        close_col="close",
+        open_col="open",
+        chunksize=1_000_000,
+        output_path=output_path,
+    )
+
+    print(daily.head(10))
+    print(f"\n✅ RV intraday journalière exportée dans : {output_path}")
+
+
+if __name__ == "__main__":
+    main()
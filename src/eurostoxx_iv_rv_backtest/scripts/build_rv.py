@@ -1,14 +1,19 @@
 # src/eurostoxx_iv_rv_backtest/scripts/build_rv.py
 
 import pandas as pd
-from eurostoxx_iv_rv_backtest.config import DATA_RAW, OUTPUTS
+from eurostoxx_iv_rv_backtest.alignment import align_to_calendar, ensure_sorted
+from eurostoxx_iv_rv_backtest.config import DATA_RAW, OUTPUTS, ensure_dirs
 
-from eurostoxx_iv_rv_backtest.features.realized_vol import add_realized_vol
+from eurostoxx_iv_rv_backtest.features.realized_vol import (
+    add_intraday_realized_vol,
+    add_realized_vol,
+)
 
 
 def main() -> None:
     input_path = DATA_RAW / "SXE50_with_IV_daily_20y.csv"
     output_path = OUTPUTS / "SXE50_with_IV_RV_daily_20y.csv"
+    intraday_path = DATA_RAW / "SXE50_intraday_daily_rv.csv"
 
     if not input_path.exists():
         raise FileNotFoundError(
@@ -20,7 +25,7 @@ def main() -> None:
     df = pd.read_csv(input_path)
 
     df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date").reset_index(drop=True)
+    df = ensure_sorted(df)
 
     df_rv = add_realized_vol(
         df,
@@ -29,8 +34,45 @@ def main() -> None:
         trading_days_per_year=252,
     )
 
+    # RV intraday (build_intraday_rv.py) prioritaire sur la RV close-to-close,
+    # qui reste en repli les jours sans barres intraday (avant le début de
+    # l'historique intraday, trous du fichier)
+    if intraday_path.exists():
+        print(f">>> RV intraday trouvée : {intraday_path}")
+        daily = pd.read_csv(intraday_path, parse_dates=["date"])
+        intraday, gaps = align_to_calendar(
+            pd.DatetimeIndex(df_rv["date"]),
+            {
+                "intraday": daily[
+                    ["date", "rv_daily_var", "bv_daily_var", "overnight_ret"]
+                ]
+            },
+            max_staleness=0,
+        )
+        print(gaps)
+
+        rv_cols = ["rv_20d", "rv_20d_pct", "rv_30d", "rv_30d_pct"]
+        close_to_close = df_rv[rv_cols]
+
+        df_rv = pd.concat([df_rv, intraday.drop(columns="date")], axis=1)
+        df_rv = add_intraday_realized_vol(
+            df_rv,
+            var_col="rv_daily_var",
+            overnight_col="overnight_ret",
+            windows=(20, 30),
+            trading_days_per_year=252,
+        )
+
+        n_intraday = int(df_rv["rv_20d"].notna().sum())
+        df_rv[rv_cols] = df_rv[rv_cols].combine_first(close_to_close)
+        print(
+            f">>> rv_20d intraday sur {n_intraday} / {len(df_rv)} jours "
+            "(close-to-close ailleurs)"
+        )
+
     print(df_rv[["date", "close", "iv", "rv_20d", "rv_30d"]].head(10))
 
+    ensure_dirs()
     df_rv.to_csv(output_path, index=False)
     print(f"\n✅ Fichier enrichi avec RV exporté dans : {output_path}")
 
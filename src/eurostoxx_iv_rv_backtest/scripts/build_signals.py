@@ -2,50 +2,14 @@
 
 import pandas as pd
 
-from eurostoxx_iv_rv_backtest.config import OUTPUTS
+from eurostoxx_iv_rv_backtest.alignment import ensure_sorted
+from eurostoxx_iv_rv_backtest.config import OUTPUTS, ensure_dirs
 from eurostoxx_iv_rv_backtest.features.realized_vol import add_forward_realized_vol
-
-
-def add_iv_rv_signal(
-    df: pd.DataFrame,
-    iv_col: str = "iv",
-    rv_col: str = "rv_20d",
-    lookback: int = 252,
-    z_entry: float = 0.5,
-) -> pd.DataFrame:
-    """
-    Ajoute :
-      - iv_minus_rv = iv - rv
-      - iv_rv_zscore = (iv_minus_rv - moyenne) / sigma sur 'lookback' jours
-      - signal_vol :
-          +1 = long vol (IV sous-évalue la RV)
-          -1 = short vol (IV surévalue la RV)
-           0 = neutre (écart limité)
-    """
-
-    df = df.copy()
-
-    if iv_col not in df.columns or rv_col not in df.columns:
-        raise ValueError("Colonnes IV/RV manquantes pour le signal.")
-
-    # Écart IV - RV (en vol annualisée)
-    df["iv_minus_rv"] = df[iv_col] - df[rv_col]
-
-    # Stats glissantes sur l'écart
-    rolling_mean = df["iv_minus_rv"].rolling(lookback).mean()
-    rolling_std = df["iv_minus_rv"].rolling(lookback).std()
-
-    df["iv_rv_zscore"] = (df["iv_minus_rv"] - rolling_mean) / rolling_std
-
-    # Signal discret : +1 / -1 / 0
-    z = df["iv_rv_zscore"]
-    signal = pd.Series(0, index=df.index, dtype="int64")
-    signal = signal.mask(z > z_entry, -1)  # IV >> RV → short vol
-    signal = signal.mask(z < -z_entry, 1)  # IV << RV → long vol
-
-    df["signal_vol"] = signal
-
-    return df
+from eurostoxx_iv_rv_backtest.features.signals import (  # noqa: F401 (ré-export)
+    add_iv_rv_robust_bank,
+    add_iv_rv_signal,
+    add_iv_rv_signal_bank,
+)
 
 
 def main() -> None:
@@ -65,11 +29,7 @@ def main() -> None:
         )
 
     print(f">>> Lecture de {input_path}")
-    df = (
-        pd.read_csv(input_path, parse_dates=["date"])
-        .sort_values(by="date")
-        .reset_index(drop=True)
-    )
+    df = ensure_sorted(pd.read_csv(input_path, parse_dates=["date"]))
 
     # Sanity check
     required = ("close", "iv", "rv_20d")
@@ -110,6 +70,7 @@ def main() -> None:
     cols = [c for c in cols if c in df.columns]
     print(df[cols].head(10))
 
+    ensure_dirs()
     df.to_csv(output_path, index=False)
     print(f"\n✅ Fichier avec RV forward + signaux exporté dans : {output_path}")
 
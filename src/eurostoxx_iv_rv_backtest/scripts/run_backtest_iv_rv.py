@@ -2,15 +2,17 @@
 
 import pandas as pd
 
-from eurostoxx_iv_rv_backtest.config import OUTPUTS
+from eurostoxx_iv_rv_backtest.alignment import ensure_sorted
+from eurostoxx_iv_rv_backtest.config import OUTPUTS, ensure_dirs
 from eurostoxx_iv_rv_backtest.features.iv_rv_variance_swap import (
+    VSTOXX_COST_MODEL,
     backtest_iv_rv_variance_swap,
 )
 
 
 def main() -> None:
     csv_path = OUTPUTS / "SXE50_with_IV_RV_daily_20y_with_signals.csv"
-    df = pd.read_csv(csv_path, parse_dates=["date"]).sort_values("date")
+    df = ensure_sorted(pd.read_csv(csv_path, parse_dates=["date"]))
 
     df_bt = backtest_iv_rv_variance_swap(
         df,
@@ -18,6 +20,7 @@ def main() -> None:
         rv_fwd_col="rv_fwd_20d",
         signal_col="signal_vol",
         notional=1.0,
+        **VSTOXX_COST_MODEL,
     )
 
     print(
@@ -25,9 +28,11 @@ def main() -> None:
             10
         )
     )
-    print("\nEquity final :", df_bt["equity_varswap"].iloc[-1])
+    print("\nEquity final (net) :", df_bt["equity_varswap"].iloc[-1])
+    print("Coûts d'exécution  :", df_bt["cost_varswap"].sum())
 
     out_path = OUTPUTS / "SXE50_iv_rv_varswap_backtest.csv"
+    ensure_dirs()
     df_bt.to_csv(out_path, index=False)
     print(f"\n✅ Backtest sauvegardé dans : {out_path}")
     print("\n=== NaN check ===")
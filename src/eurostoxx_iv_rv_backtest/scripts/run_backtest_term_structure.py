@@ -0,0 +1,61 @@
+# src/eurostoxx_iv_rv_backtest/scripts/run_backtest_term_structure.py
+
+import pandas as pd
+
+from eurostoxx_iv_rv_backtest.alignment import ensure_sorted
+from eurostoxx_iv_rv_backtest.config import DATA_RAW, OUTPUTS, ensure_dirs
+from eurostoxx_iv_rv_backtest.features.iv_rv_variance_swap import VSTOXX_COST_MODEL
+from eurostoxx_iv_rv_backtest.features.term_structure import (
+    VSTOXX_TENORS,
+    add_term_structure_rv,
+    add_term_structure_signals,
+    backtest_term_structure,
+)
+
+
+def main() -> None:
+    """
+    Backtest IV vs RV sur toute la courbe VSTOXX (1M ... 24M) + spreads
+    calendaires, et écrit :
+
+      outputs/SXE50_iv_rv_term_structure_backtest.csv
+    """
+
+    input_path = DATA_RAW / "SXE50_with_IV_term_daily_20y.csv"
+    output_path = OUTPUTS / "SXE50_iv_rv_term_structure_backtest.csv"
+
+    if not input_path.exists():
+        raise FileNotFoundError(
+            f"Fichier d'entrée introuvable : {input_path}\n"
+            "Tu as bien lancé data/raw/getdata.py avant ?"
+        )
+
+    print(f">>> Lecture de {input_path}")
+    df = ensure_sorted(pd.read_csv(input_path, parse_dates=["date"]))
+
+    # Ténors réellement présents dans le fichier
+    tenors = {t: h for t, h in VSTOXX_TENORS.items() if f"iv_{t}" in df.columns}
+    if not tenors:
+        raise RuntimeError(
+            f"Aucune colonne iv_<ténor> trouvée (colonnes dispo = {list(df.columns)})"
+        )
+
+    df = add_term_structure_rv(df, tenors=tenors, price_col="close")
+    df = add_term_structure_signals(df, tenors=tenors, lookback=252, z_entry=0.5)
+    df_bt = backtest_term_structure(
+        df, tenors=tenors, notional=1.0, **VSTOXX_COST_MODEL
+    )
+
+    equity_cols = [
+        c for c in df_bt.columns if c.startswith(("equity_varswap_", "equity_cal_"))
+    ]
+    print("\nEquity finale par ténor / spread :")
+    print(df_bt[equity_cols].iloc[-1])
+
+    ensure_dirs()
+    df_bt.to_csv(output_path, index=False)
+    print(f"\n✅ Backtest courbe sauvegardé dans : {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# src/eurostoxx_iv_rv_backtest/scripts/run_sweep.py
+
+import pandas as pd
+
+from eurostoxx_iv_rv_backtest.alignment import ensure_sorted
+from eurostoxx_iv_rv_backtest.config import OUTPUTS, ensure_dirs
+from eurostoxx_iv_rv_backtest.features.iv_rv_variance_swap import VSTOXX_COST_MODEL
+from eurostoxx_iv_rv_backtest.sweep import make_param_grid, run_sweep
+
+
+def main() -> None:
+    """
+    Sweep lookback x z_entry du signal IV-RV (mémoire partagée, tous les cœurs)
+    et écrit :
+
+      outputs/SXE50_iv_rv_sweep.csv
+    """
+
+    input_path = OUTPUTS / "SXE50_with_IV_RV_daily_20y_with_signals.csv"
+    output_path = OUTPUTS / "SXE50_iv_rv_sweep.csv"
+
+    if not input_path.exists():
+        raise FileNotFoundError(
+            f"Fichier d'entrée introuvable : {input_path}\n"
+            "Tu dois d'abord lancer build_signals.py."
+        )
+
+    print(f">>> Lecture de {input_path}")
+    df = ensure_sorted(pd.read_csv(input_path, parse_dates=["date"]))
+
+    grid = make_param_grid(
+        lookbacks=range(21, 505, 21),
+        z_entries=[0.25 * k for k in range(1, 9)],
+        rv_cols=[c for c in ("rv_20d", "rv_30d") if c in df.columns],
+    )
+    print(f">>> {len(grid)} jeux de paramètres")
+
+    # Classement net de coûts (bid / ask + turnover)
+    res = run_sweep(
+        df,
+        grid,
+        iv_col="iv",
+        rv_fwd_col="rv_fwd_20d",
+        notional=1.0,
+        cost_model=VSTOXX_COST_MODEL,
+    )
+
+    print(res.sort_values("sharpe", ascending=False).head(10))
+
+    ensure_dirs()
+    res.to_csv(output_path, index=False)
+    print(f"\n✅ Sweep sauvegardé dans : {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+# src/eurostoxx_iv_rv_backtest/sweep.py
+
+import itertools
+import json
+import os
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from eurostoxx_iv_rv_backtest.features.iv_rv_variance_swap import (
+    exposure_turnover,
+    held_exposure,
+    varswap_pnl_matrix,
+)
+from eurostoxx_iv_rv_backtest.features.signals import add_iv_rv_signal
+
+# Métriques écrites pour chaque jeu de paramètres (une ligne du tableau résultat)
+# (equity_final / pnl_* / sharpe sont nets de coûts)
+METRICS = (
+    "equity_final",
+    "equity_gross",
+    "cost_total",
+    "pnl_mean",
+    "pnl_std",
+    "sharpe",
+    "turnover",
+)
+
+# Âge (s) au-delà duquel un shard en cours est considéré abandonné et remis
+# dans la file (worker mort, nœud perdu)
+STALE_AFTER_SECONDS = 3600
+
+# Spécification d'un tableau partagé : nom -> (nom du segment shm, shape, dtype)
+ArraySpec = Dict[str, Tuple[str, Tuple[int, ...], str]]
+
+
+def make_param_grid(
+    lookbacks: Sequence[int],
+    z_entries: Sequence[float],
+    rv_cols: Sequence[str] = ("rv_20d",),
+) -> List[Dict]:
+    """
+    Produit cartésien des paramètres de add_iv_rv_signal, trié pour que les
+    jeux partageant (rv_col, lookback) soient contigus : un shard ne calcule
+    alors chaque z-score qu'une fois.
+    """
+    return [
+        {"rv_col": rv, "lookback": int(lb), "z_entry": float(z)}
+        for rv, lb, z in itertools.product(rv_cols, lookbacks, z_entries)
+    ]
+
+
+def _shards(n_params: int, shard_size: int) -> List[Tuple[int, int]]:
+    return [(i, min(i + shard_size, n_params)) for i in range(0, n_params, shard_size)]
+
+
+def _base_arrays(
+    df: pd.DataFrame,
+    param_grid: Sequence[Mapping],
+    iv_col: str,
+    rv_fwd_col: str,
+) -> Dict[str, np.ndarray]:
+    """Colonnes de base (float64 contigus) nécessaires à la grille."""
+    cols = {"iv": iv_col, "rv_fwd": rv_fwd_col}
+    for p in param_grid:
+        cols[p["rv_col"]] = p["rv_col"]
+
+    missing = [c for c in cols.values() if c not in df.columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes pour le sweep : {missing}")
+
+    return {
+        name: np.ascontiguousarray(df[col].to_numpy(dtype="float64"))
+        for name, col in cols.items()
+    }
+
+
+def sweep_metrics(
+    iv: np.ndarray,
+    rv_fwd: np.ndarray,
+    signals: np.ndarray,
+    **pnl_kwargs,
+) -> np.ndarray:
+    """
+    Métriques nettes de coûts pour une matrice de signaux (temps x paramètres)
+    en une passe : shape (n_params, len(METRICS)).
+
+    pnl_kwargs : notional, sizing, capacity, half_spread_floor,
+    half_spread_slope, cost_per_turnover (voir varswap_pnl_matrix).
+    turnover porte sur l'exposition tenue, comme le coût de turnover.
+    """
+    gross, cost = varswap_pnl_matrix(iv, rv_fwd, signals, **pnl_kwargs)
+    pnl = gross - cost
+    held = held_exposure(
+        iv,
+        rv_fwd,
+        signals,
+        pnl_kwargs.get("notional", 1.0),
+        pnl_kwargs.get("capacity"),
+    )
+
+    mean = pnl.mean(axis=0)
+    std = pnl.std(axis=0, ddof=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(252), np.nan)
+
+    return np.column_stack(
+        [
+            pnl.sum(axis=0),
+            gross.sum(axis=0),
+            cost.sum(axis=0),
+            mean,
+            std,
+            sharpe,
+            exposure_turnover(held).sum(axis=0),
+        ]
+    )
+
+
+def _evaluate(
+    arrays: Mapping[str, np.ndarray],
+    param_grid: Sequence[Mapping],
+    start: int,
+    stop: int,
+    pnl_kwargs: Mapping,
+    out: np.ndarray,
+) -> None:
+    """
+    Évalue les paramètres [start, stop) et écrit les métriques dans
+    out[0 : stop - start] (vue sur le tableau résultat préalloué).
+    Les signaux du shard forment une matrice (temps x paramètres) évaluée
+    (PnL + coûts) en une seule passe.
+    """
+    iv = arrays["iv"]
+    rv_fwd = arrays["rv_fwd"]
+
+    zscores: Dict[Tuple[str, int], np.ndarray] = {}
+    signals = np.empty((len(iv), stop - start))
+
+    for k, i in enumerate(range(start, stop)):
+        p = param_grid[i]
+        key = (p["rv_col"], p["lookback"])
+
+        if key not in zscores:
+            frame = pd.DataFrame({"iv": iv, p["rv_col"]: arrays[p["rv_col"]]})
+            sig = add_iv_rv_signal(frame, "iv", p["rv_col"], lookback=p["lookback"])
+            zscores = {key: sig["iv_rv_zscore"].to_numpy()}
+
+        z = zscores[key]
+        signals[:, k] = np.where(
+            z > p["z_entry"], -1.0, np.where(z < -p["z_entry"], 1.0, 0.0)
+        )
+
+    out[:] = sweep_metrics(iv, rv_fwd, signals, **pnl_kwargs)
+
+
+def _pnl_kwargs(notional: float, cost_model: Optional[Mapping]) -> Dict:
+    return {"notional": notional, **(cost_model or {})}
+
+
+# =========================
+# Mémoire partagée (une machine)
+# =========================
+
+_WORKER: Dict = {}
+
+
+def _to_shared(arrays: Mapping[str, np.ndarray]) -> Tuple[ArraySpec, Dict]:
+    """Copie chaque tableau une seule fois dans un segment shared_memory."""
+    spec: ArraySpec = {}
+    blocks = {}
+    for name, arr in arrays.items():
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+        spec[name] = (shm.name, arr.shape, arr.dtype.str)
+        blocks[name] = shm
+    return spec, blocks
+
+
+def _attach(spec: ArraySpec) -> Tuple[Dict[str, np.ndarray], List]:
+    arrays = {}
+    blocks = []
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        blocks.append(shm)
+    return arrays, blocks
+
+
+def _init_worker(
+    spec: ArraySpec, param_grid: Sequence[Mapping], pnl_kwargs: Mapping
+) -> None:
+    """Initializer : attache les tableaux partagés une fois par process."""
+    arrays, blocks = _attach(spec)
+    _WORKER.update(
+        arrays=arrays, blocks=blocks, param_grid=param_grid, pnl_kwargs=pnl_kwargs
+    )
+
+
+def _run_shard(shard: Tuple[int, int]) -> int:
+    start, stop = shard
+    out = _WORKER["arrays"]["result"][start:stop]
+    _evaluate(
+        _WORKER["arrays"],
+        _WORKER["param_grid"],
+        start,
+        stop,
+        _WORKER["pnl_kwargs"],
+        out,
+    )
+    return stop - start
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    param_grid: Sequence[Mapping],
+    iv_col: str = "iv",
+    rv_fwd_col: str = "rv_fwd_20d",
+    notional: float = 1.0,
+    n_workers: Optional[int] = None,
+    shard_size: int = 64,
+    cost_model: Optional[Mapping] = None,
+) -> pd.DataFrame:
+    """
+    Sweep (add_iv_rv_signal + backtest variance swap) sur toute la grille.
+
+    Les colonnes de base sont copiées une seule fois en shared_memory ; les
+    workers ne reçoivent que des bornes de shard (start, stop) et écrivent
+    directement dans un tableau résultat partagé (n_params x len(METRICS)).
+    Aucun DataFrame n'est picklé.
+
+    cost_model : paramètres de coûts / sizing passés à varswap_pnl_matrix
+    (ex: {"half_spread_floor": 0.0025, "cost_per_turnover": 0.001}).
+    """
+    arrays = _base_arrays(df, param_grid, iv_col, rv_fwd_col)
+    arrays["result"] = np.full((len(param_grid), len(METRICS)), np.nan)
+
+    spec, blocks = _to_shared(arrays)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(spec, list(param_grid), _pnl_kwargs(notional, cost_model)),
+        ) as pool:
+            for _ in pool.map(_run_shard, _shards(len(param_grid), shard_size)):
+                pass
+
+        _, shape, dtype = spec["result"]
+        result = np.ndarray(shape, dtype=dtype, buffer=blocks["result"].buf).copy()
+    finally:
+        for shm in blocks.values():
+            shm.close()
+            shm.unlink()
+
+    return pd.concat(
+        [pd.DataFrame(list(param_grid)), pd.DataFrame(result, columns=list(METRICS))],
+        axis=1,
+    )
+
+
+# =========================
+# File de travail sur disque (plusieurs nœuds, FS partagé)
+# =========================
+
+
+def init_file_queue(
+    queue_dir: Path,
+    df: pd.DataFrame,
+    param_grid: Sequence[Mapping],
+    iv_col: str = "iv",
+    rv_fwd_col: str = "rv_fwd_20d",
+    notional: float = 1.0,
+    shard_size: int = 64,
+    cost_model: Optional[Mapping] = None,
+) -> Path:
+    """
+    Prépare une file de travail dans 'queue_dir' :
+      - un .npy par colonne de base (lu en memmap par les workers)
+      - grid.json (grille + notional / modèle de coûts)
+      - un fichier shard_XXXXX.todo par shard
+    Les workers (run_file_queue_worker) peuvent tourner sur plusieurs nœuds.
+    Refuse un dossier contenant déjà une file (grid.json / shard_*) : les
+    résultats d'une grille précédente seraient relus par collect_file_queue.
+    """
+    queue_dir = Path(queue_dir)
+    queue_dir.mkdir(parents=True, exist_ok=True)
+
+    if (queue_dir / "grid.json").exists() or any(queue_dir.glob("shard_*")):
+        raise FileExistsError(
+            f"Le dossier {queue_dir} contient déjà une file de travail ; "
+            "utiliser un dossier vide."
+        )
+
+    for name, arr in _base_arrays(df, param_grid, iv_col, rv_fwd_col).items():
+        np.save(queue_dir / f"{name}.npy", arr)
+
+    meta = {
+        "param_grid": list(param_grid),
+        "pnl_kwargs": _pnl_kwargs(notional, cost_model),
+        "shard_size": int(shard_size),
+    }
+    (queue_dir / "grid.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    for k, (start, stop) in enumerate(_shards(len(param_grid), shard_size)):
+        (queue_dir / f"shard_{k:05d}.todo").write_text(f"{start} {stop}")
+
+    return queue_dir
+
+
+def _host() -> str:
+    """Nom du nœud, sans '.' (il sert de suffixe aux fichiers de shard)."""
+    return socket.gethostname().replace(".", "_")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def requeue_stale_shards(
+    queue_dir: Path, stale_after: float = STALE_AFTER_SECONDS
+) -> List[str]:
+    """
+    Remet en .todo les shards .running-<host>-<pid> abandonnés : process mort
+    sur ce nœud, ou pas de nouvelles depuis plus de 'stale_after' secondes
+    (workers distants). Renvoie les noms des shards remis dans la file.
+    """
+    queue_dir = Path(queue_dir)
+    host = _host()
+    now = time.time()
+
+    requeued = []
+    for running in sorted(queue_dir.glob("shard_*.running-*")):
+        owner = running.suffix[len(".running-") :]
+        owner_host, _, pid = owner.rpartition("-")
+        try:
+            age = now - running.stat().st_mtime
+        except FileNotFoundError:
+            continue  # terminé entre-temps
+
+        dead = owner_host == host and pid.isdigit() and not _pid_alive(int(pid))
+        if not dead and age <= stale_after:
+            continue
+
+        try:
+            os.rename(running, running.with_suffix(".todo"))
+        except FileNotFoundError:
+            continue  # terminé ou déjà remis par un autre worker
+        requeued.append(running.stem)
+
+    return requeued
+
+
+def _claim_shard(queue_dir: Path, owner: str) -> Optional[Tuple[Path, int, int]]:
+    """
+    Réclame le premier shard .todo libre (rename atomique) ; renvoie
+    (fichier .running, start, stop).
+    """
+    for todo in sorted(queue_dir.glob("shard_*.todo")):
+        running = todo.with_suffix(f".running-{owner}")
+        try:
+            os.rename(todo, running)
+            # rename garde le mtime du .todo : l'âge du shard part de sa prise.
+            # Un autre worker a pu le remettre dans la file entre-temps (file
+            # plus vieille que stale_after) : on passe alors au suivant.
+            os.utime(running)
+            start, stop = map(int, running.read_text().split())
+        except FileNotFoundError:
+            continue  # déjà pris (ou remis dans la file) par un autre worker
+        return running, start, stop
+    return None
+
+
+def _queue_loop(queue_dir: Path, stale_after: float = STALE_AFTER_SECONDS) -> int:
+    """
+    Réclame des shards jusqu'à épuisement de la file, en reprenant en fin de
+    file les shards abandonnés (voir requeue_stale_shards).
+    """
+    meta = json.loads((queue_dir / "grid.json").read_text(encoding="utf-8"))
+    names = {"iv", "rv_fwd"} | {p["rv_col"] for p in meta["param_grid"]}
+    arrays = {n: np.load(queue_dir / f"{n}.npy", mmap_mode="r") for n in names}
+    owner = f"{_host()}-{os.getpid()}"
+
+    done = 0
+    while True:
+        claim = _claim_shard(queue_dir, owner)
+        if claim is None and requeue_stale_shards(queue_dir, stale_after):
+            claim = _claim_shard(queue_dir, owner)
+        if claim is None:
+            break
+
+        running, start, stop = claim
+        out = np.full((stop - start, len(METRICS)), np.nan)
+        _evaluate(arrays, meta["param_grid"], start, stop, meta["pnl_kwargs"], out)
+
+        np.save(queue_dir / f"{running.stem}.npy", out)
+        try:
+            os.rename(running, running.with_suffix(".done"))
+        except FileNotFoundError:
+            # Remis dans la file pendant le calcul : le résultat est écrit,
+            # on marque le shard terminé s'il n'a pas été repris entre-temps
+            try:
+                os.rename(running.with_suffix(".todo"), running.with_suffix(".done"))
+            except FileNotFoundError:
+                pass
+        done += 1
+
+    return done
+
+
+def run_file_queue_worker(
+    queue_dir: Path, n_workers: int = 1, stale_after: float = STALE_AFTER_SECONDS
+) -> int:
+    """Lance n_workers process locaux sur la file ; renvoie le nb de shards faits."""
+    queue_dir = Path(queue_dir)
+    if n_workers <= 1:
+        return _queue_loop(queue_dir, stale_after)
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return sum(
+            pool.map(_queue_loop, [queue_dir] * n_workers, [stale_after] * n_workers)
+        )
+
+
+def collect_file_queue(queue_dir: Path, allow_partial: bool = False) -> pd.DataFrame:
+    """
+    Assemble les résultats de la file. Seuls les shards .done attendus pour
+    la grille de grid.json (même découpage start / stop) sont relus. Lève une
+    RuntimeError (liste des shards manquants) si la file n'est pas terminée,
+    sauf avec allow_partial : les lignes manquantes valent alors NaN.
+    """
+    queue_dir = Path(queue_dir)
+    meta = json.loads((queue_dir / "grid.json").read_text(encoding="utf-8"))
+    grid = meta["param_grid"]
+
+    result = np.full((len(grid), len(METRICS)), np.nan)
+    pending = []
+    for k, (start, stop) in enumerate(_shards(len(grid), meta["shard_size"])):
+        done = queue_dir / f"shard_{k:05d}.done"
+        try:
+            bounds = tuple(map(int, done.read_text().split()))
+            values = np.load(queue_dir / f"shard_{k:05d}.npy")
+        except (FileNotFoundError, ValueError):
+            pending.append(done.stem)
+            continue
+        if bounds != (start, stop) or values.shape != (stop - start, len(METRICS)):
+            pending.append(done.stem)
+            continue
+        result[start:stop] = values
+
+    if pending and not allow_partial:
+        raise RuntimeError(
+            f"{len(pending)} shard(s) non terminé(s) dans {queue_dir} : "
+            f"{pending[:10]} (requeue_stale_shards pour reprendre les abandonnés)"
+        )
+
+    return pd.concat(
+        [pd.DataFrame(grid), pd.DataFrame(result, columns=list(METRICS))], axis=1
+    )
+
+
+if __name__ == "__main__":
+    # Worker d'une file partagée : python -m eurostoxx_iv_rv_backtest.sweep <dir> [n]
+    if len(sys.argv) < 2:
+        raise SystemExit(
+            "usage: python -m eurostoxx_iv_rv_backtest.sweep <queue_dir> [n_workers]"
+        )
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    print(f"Shards traités : {run_file_queue_worker(Path(sys.argv[1]), n)}")